@@ -3,21 +3,27 @@
 
 import sys
 import argparse
+import importlib
 
-import geneflow.cli.common
-import geneflow.cli.add_apps
-import geneflow.cli.add_workflows
-import geneflow.cli.help
-import geneflow.cli.init_db
-import geneflow.cli.install_workflow
-import geneflow.cli.make_app
-import geneflow.cli.migrate_db
-import geneflow.cli.run
-import geneflow.cli.run_pending
 from geneflow.log import Log
 from geneflow import __version__
 
 
+# sub-command modules and help, only the module of the selected sub-command
+# is imported and used to fully initialize its sub-parser
+SUBCOMMANDS = {
+    'add-apps': ('geneflow.cli.add_apps', 'add apps to database'),
+    'add-workflows': ('geneflow.cli.add_workflows', 'add workflows to database'),
+    'help': ('geneflow.cli.help', 'GeneFlow workflow help'),
+    'init-db': ('geneflow.cli.init_db', 'initialize database'),
+    'install-workflow': ('geneflow.cli.install_workflow', 'install workflow'),
+    'make-app': ('geneflow.cli.make_app', 'make app from templates'),
+    'migrate-db': ('geneflow.cli.migrate_db', 'migrate database'),
+    'run': ('geneflow.cli.run', 'run a GeneFlow workflow'),
+    'run-pending': ('geneflow.cli.run_pending', 'run pending workflow jobs')
+}
+
+
 def parse_args():
     """
     Parse command line arguments.
@@ -26,31 +32,20 @@ def parse_args():
         None.
 
     Returns:
-        Command line arguments.
+        On success: Command line arguments and the selected sub-parser.
+        On failure: False and None.
 
     """
-    parser = argparse.ArgumentParser(
-        description='GeneFlow CLI',
-        prog='gf'
-    )
-
-    # print version
-    parser.add_argument(
-        '-v',
-        '--version',
-        action='version',
-        version='%(prog)s {}'.format(__version__)
-    )
-
     # shared arguments
-    parser.add_argument(
+    shared_parser = argparse.ArgumentParser(add_help=False)
+    shared_parser.add_argument(
         '--log-level',
         type=str,
         default='info',
         dest='log_level',
         help='logging level'
     )
-    parser.add_argument(
+    shared_parser.add_argument(
         '--log-file',
         type=str,
         default=None,
@@ -58,26 +53,48 @@ def parse_args():
         help='log file'
     )
 
+    # the sub-command is the first positional argument, parsed with the
+    # shared arguments so that their values aren't mistaken for it
+    command_parser = argparse.ArgumentParser(
+        add_help=False, parents=[shared_parser]
+    )
+    command_parser.add_argument('command', nargs='?')
+    command = command_parser.parse_known_args()[0].command
+
+    parser = argparse.ArgumentParser(
+        description='GeneFlow CLI',
+        prog='gf',
+        parents=[shared_parser]
+    )
+
+    # print version
+    parser.add_argument(
+        '-v',
+        '--version',
+        action='version',
+        version='%(prog)s {}'.format(__version__)
+    )
+
     parser.set_defaults(func=None)
     subparsers = parser.add_subparsers(help='Functions', dest='command')
     subparser_dict = {}
 
-    # configure arguments for sub-commands
-    subparser_dict['add-apps'] = geneflow.cli.add_apps.init_subparser(subparsers)
-    subparser_dict['add-workflows'] = geneflow.cli.add_workflows.init_subparser(subparsers)
-    subparser_dict['help'] = geneflow.cli.help.init_subparser(subparsers)
-    subparser_dict['init-db'] = geneflow.cli.init_db.init_subparser(subparsers)
-    subparser_dict['install-workflow'] = geneflow.cli.install_workflow.init_subparser(subparsers)
-    subparser_dict['make-app'] = geneflow.cli.make_app.init_subparser(subparsers)
-    subparser_dict['migrate-db'] = geneflow.cli.migrate_db.init_subparser(subparsers)
-    subparser_dict['run'] = geneflow.cli.run.init_subparser(subparsers)
-    subparser_dict['run-pending'] = geneflow.cli.run_pending.init_subparser(subparsers)
+    # configure arguments for the selected sub-command, other sub-commands
+    # only need a placeholder for the top-level help
+    for name, (module_name, command_help) in SUBCOMMANDS.items():
+        if name == command:
+            module = importlib.import_module(module_name)
+            subparser_dict[name] = module.init_subparser(subparsers)
+        else:
+            subparser_dict[name] = subparsers.add_parser(
+                name, help=command_help
+            )
 
     # parse arguments
     args = parser.parse_known_args()
     if not args[0].func:
         parser.print_help()
-        return False
+        return False, None
 
     return args, subparser_dict[args[0].command]
 
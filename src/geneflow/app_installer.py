@@ -1,25 +1,22 @@
 """This module contains the GeneFlow App Installer class."""
 
 
+import json
+import os
 from pathlib import Path
-import pprint
-import cerberus
 import shutil
-from git import Repo
-from git.exc import GitError
-import os
 from slugify import slugify
 import stat
+import tempfile
+import threading
 import yaml
-from slugify import slugify
 
 from geneflow.data_manager import DataManager
 from geneflow.definition import Definition
-from geneflow.log import Log
-from geneflow.shell_wrapper import ShellWrapper
+from geneflow import yaml_io
+from geneflow.log import LazyFormat, Log
 from geneflow.template_compiler import TemplateCompiler
 from geneflow.uri_parser import URIParser
-from geneflow.extend.agave_wrapper import AgaveWrapper
 
 
 class AppInstaller:
@@ -33,7 +30,8 @@ class AppInstaller:
     def __init__(
             self,
             path,
-            app_info
+            app_info,
+            partial_clone=False
     ):
         """
         Initialize the GeneFlow AppInstaller class.
@@ -42,6 +40,8 @@ class AppInstaller:
             self: class instance
             path: local path to the app package
             app_info: app information from workflow definition (name, git repo, version)
+            partial_clone: defer download of file contents (blobs) until
+                needed when cloning the app repo
 
         Returns:
             None
@@ -49,25 +49,25 @@ class AppInstaller:
         """
         self._path = Path(path)
         self._app_info = app_info
+        self._partial_clone = partial_clone
 
         # app definition, which should be in the root of the app package
         self._app = None
 
+        # slugified app name, set when app definition is loaded
+        self._slug_name = None
+
 
     @classmethod
     def _yaml_to_dict(cls, path):
 
-        # read yaml file
+        # read yaml file and convert to dict
         try:
-            with open(path, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
+            with open(path, 'rb') as yaml_file:
+                yaml_dict = yaml_io.safe_load(yaml_file)
         except IOError as err:
             Log.an().warning('cannot read yaml file: %s [%s]', path, str(err))
             return False
-
-        # convert to dict
-        try:
-            yaml_dict = yaml.safe_load(yaml_data)
         except yaml.YAMLError as err:
             Log.an().warning('invalid yaml file: %s [%s]', path, str(err))
             return False
@@ -75,6 +75,18 @@ class AppInstaller:
         return yaml_dict
 
 
+    @staticmethod
+    def _agave_version(version):
+
+        # agave app versions can only contain numbers and periods
+        agave_version = slugify(version.lower()).replace('-', '.')
+        if agave_version.islower():
+            # contains letters, invalid version
+            return None
+
+        return agave_version
+
+
     def clone_git_repo(self):
         """
         Clone app from git repo.
@@ -87,33 +99,59 @@ class AppInstaller:
             On failure: False
 
         """
-        # remove app folder if it exists
-        if self._path.is_dir():
-            shutil.rmtree(str(self._path))
+        # GitPython is only needed when cloning
+        from git import Repo
+        from git.exc import GitError
+
+        # move app folder out of the way if it exists, and remove it in the
+        # background while cloning
+        remove_thread = None
+        try:
+            old_path = self._path.with_name(
+                '{}.old.{}'.format(self._path.name, os.urandom(4).hex())
+            )
+            os.rename(str(self._path), str(old_path))
+            remove_thread = threading.Thread(
+                target=shutil.rmtree,
+                args=(str(old_path),),
+                kwargs={'ignore_errors': True}
+            )
+            remove_thread.start()
+        except FileNotFoundError:
+            pass
 
         # recreate app folder
         self._path.mkdir()
 
-        # clone app's git repo into target location
+        # clone app's git repo into target location, only the latest commit
+        # of the requested version is needed
+        clone_options = {'config': 'http.sslVerify=false', 'depth': 1}
+        if self._partial_clone:
+            clone_options['filter'] = 'blob:none'
+
+        clone_result = True
         try:
             if self._app_info['version']:
                 Repo.clone_from(
                     self._app_info['git'], str(self._path), branch=self._app_info['version'],
-                    config='http.sslVerify=false'
+                    single_branch=True, **clone_options
                 )
             else:
                 Repo.clone_from(
-                    self._app_info['git'], str(self._path),
-                    config='http.sslVerify=false'
+                    self._app_info['git'], str(self._path), **clone_options
                 )
         except GitError as err:
             Log.an().error(
                 'cannot clone app git repo: %s [%s]',
                 self._app_info['git'], str(err)
             )
-            return False
+            clone_result = False
 
-        return True
+        # wait for old app folder to be removed
+        if remove_thread:
+            remove_thread.join()
+
+        return clone_result
 
 
     def load_app(self):
@@ -146,14 +184,18 @@ class AppInstaller:
             return False
 
         # check formatting of version
-        self._app['agave_version'] = slugify(self._app['version'].lower()).replace('-','.')
-        if self._app['agave_version'].islower():
-            # contains letters, invalid version
+        self._app['agave_version'] = self._agave_version(self._app['version'])
+        if self._app['agave_version'] is None:
             Log.an().error(
                 'app config validation error: app version cannot contain letters'
             )
             return False
 
+        # slugified app name used for script and agave app names
+        self._slug_name = slugify(
+            self._app['name'], regex_pattern=r'[^-a-z0-9_]+'
+        )
+
         return True
 
 
@@ -193,23 +235,20 @@ class AppInstaller:
         """
         Log.some().info('updating %s', str(self._path / 'app.yaml'))
 
+        # build implementation section and append it in a single write
+        implementation = '\n\nimplementation:'
+        if agave:
+            implementation += '\n  agave:\n    agave_app_id: {}-{}-{}{}'.format(
+                agave['apps_prefix'],
+                self._slug_name,
+                self._app['agave_version'],
+                agave['revision']
+            )
+        implementation += '\n  local:\n    script: {}.sh'.format(self._slug_name)
+
         try:
             with open(str(self._path / 'app.yaml'), 'a') as app_yaml:
-                app_yaml.write('\n\nimplementation:')
-                if agave:
-                    app_yaml.write('\n  agave:')
-                    app_yaml.write(
-                        '\n    agave_app_id: {}-{}-{}{}'.format(
-                            agave['apps_prefix'],
-                            slugify(self._app['name'], regex_pattern=r'[^-a-z0-9_]+'),
-                            self._app['agave_version'],
-                            agave['revision']
-                        )
-                    )
-                app_yaml.write('\n  local:')
-                app_yaml.write(
-                    '\n    script: {}.sh'.format(slugify(self._app['name'], regex_pattern=r'[^-a-z0-9_]+'))
-                )
+                app_yaml.write(implementation)
         except IOError as err:
             Log.an().error('cannot update GeneFlow app definition: %s', err)
             return False
@@ -235,7 +274,7 @@ class AppInstaller:
                 None,
                 'agave-app-def.json.j2.j2',
                 str(self._path / 'agave-app-def.json.j2'),
-                slugify_name=slugify(self._app['name'], regex_pattern=r'[^-a-z0-9_]+'),
+                slugify_name=self._slug_name,
                 **self._app
         ):
             Log.an().error('cannot compile GeneFlow Agave app definition template')
@@ -260,22 +299,20 @@ class AppInstaller:
         asset_path = Path(self._path / 'assets')
         asset_path.mkdir(exist_ok=True)
 
-        script_path = str(asset_path / '{}.sh'.format(slugify(self._app['name'], regex_pattern=r'[^-a-z0-9_]+')))
+        script_path = str(asset_path / '{}.sh'.format(self._slug_name))
         Log.some().info('compiling %s', script_path)
 
-        # compile jinja2 template
+        # compile jinja2 template, executable by owner
         if not TemplateCompiler.compile_template(
                 None,
                 'wrapper-script.sh.j2',
                 script_path,
+                mode=stat.S_IRWXU,
                 **self._app
         ):
             Log.an().error('cannot compile GeneFlow app wrapper script')
             return False
 
-        # make script executable by owner
-        os.chmod(script_path, stat.S_IRWXU)
-
         return True
 
 
@@ -298,19 +335,17 @@ class AppInstaller:
         script_path = str(test_path / 'test.sh')
         Log.some().info('compiling %s', script_path)
 
-        # compile jinja2 template
+        # compile jinja2 template, executable by owner
         if not TemplateCompiler.compile_template(
                 None,
                 'test.sh.j2',
                 script_path,
+                mode=stat.S_IRWXU,
                 **self._app
         ):
             Log.an().error('cannot compile GeneFlow app test script')
             return False
 
-        # make script executable by owner
-        os.chmod(script_path, stat.S_IRWXU)
-
         return True
 
 
@@ -318,6 +353,9 @@ class AppInstaller:
         """
         Register app in Agave.
 
+        The main agave apps folder (appsDir) must already exist, it is
+        created once per workflow by the WorkflowInstaller.
+
         Args:
             self: class instance
 
@@ -329,39 +367,29 @@ class AppInstaller:
         Log.some().info('registering agave app %s', str(self._path))
         Log.some().info('app version: %s', self._app['version'])
 
-        # compile agave app template
-        if not TemplateCompiler.compile_template(
-                self._path,
-                'agave-app-def.json.j2',
-                self._path / 'agave-app-def.json',
-                version=self._app['version'],
-                agave=agave_params['agave']
-        ):
+        # compile agave app template, keep the rendered definition for
+        # registration and save a copy in the app package
+        app_definition_json = TemplateCompiler.render_template(
+            self._path,
+            'agave-app-def.json.j2',
+            version=self._app['version'],
+            agave=agave_params['agave']
+        )
+        if app_definition_json is False:
             Log.a().warning(
                 'cannot compile agave app "%s" definition from template',
                 self._app_info['name']
             )
             return False
 
-        # create main apps URI
-        parsed_agave_apps_uri = URIParser.parse(
-            'agave://{}/{}'.format(
-                agave_params['agave']['deploymentSystem'],
-                agave_params['agave']['appsDir']
+        try:
+            with open(str(self._path / 'agave-app-def.json'), 'w') as app_def_file:
+                app_def_file.write(app_definition_json)
+        except IOError as err:
+            Log.a().warning(
+                'cannot write agave app definition: %s [%s]',
+                str(self._path / 'agave-app-def.json'), str(err)
             )
-        )
-        Log.some().info(
-            'creating main apps uri: %s',
-            parsed_agave_apps_uri['chopped_uri']
-        )
-        if not DataManager.mkdir(
-                parsed_uri=parsed_agave_apps_uri,
-                recursive=True,
-                agave={
-                    'agave_wrapper': agave_wrapper
-                }
-        ):
-            Log.a().warning('cannot create main agave apps uri')
             return False
 
         # delete app uri if it exists
@@ -369,7 +397,7 @@ class AppInstaller:
             'agave://{}/{}/{}-{}'.format(
                 agave_params['agave']['deploymentSystem'],
                 agave_params['agave']['appsDir'],
-                slugify(self._app['name'], regex_pattern=r'[^-a-z0-9_]+'),
+                self._slug_name,
                 self._app['version']
             )
         )
@@ -388,22 +416,45 @@ class AppInstaller:
                 'cannot delete app uri: %s', parsed_app_uri['chopped_uri']
             )
 
-        # upload app assets
-        parsed_assets_uri = URIParser.parse(str(self._path / 'assets'))
+        # stage a copy of the app assets with the test script in a temp
+        # folder so both are uploaded together
+        staged_path = Path(tempfile.mkdtemp())
+        staged_assets_path = staged_path / 'assets'
+        try:
+            shutil.copytree(
+                str(self._path / 'assets'), str(staged_assets_path)
+            )
+            (staged_assets_path / 'test').mkdir(exist_ok=True)
+            shutil.copy2(
+                str(self._path / 'test' / 'test.sh'),
+                str(staged_assets_path / 'test' / 'test.sh')
+            )
+        except (OSError, shutil.Error) as err:
+            Log.a().warning(
+                'cannot stage app assets in %s [%s]',
+                str(staged_path), str(err)
+            )
+            shutil.rmtree(str(staged_path), ignore_errors=True)
+            return False
+
+        # upload app assets and test script
+        parsed_assets_uri = URIParser.parse(str(staged_assets_path))
         Log.some().info(
             'copying app assets from %s to %s',
             parsed_assets_uri['chopped_uri'],
             parsed_app_uri['chopped_uri']
         )
 
-        if not DataManager.copy(
-                parsed_src_uri=parsed_assets_uri,
-                parsed_dest_uri=parsed_app_uri,
-                local={},
-                agave={
-                    'agave_wrapper': agave_wrapper
-                }
-        ):
+        copy_result = DataManager.copy(
+            parsed_src_uri=parsed_assets_uri,
+            parsed_dest_uri=parsed_app_uri,
+            local={},
+            agave={
+                'agave_wrapper': agave_wrapper
+            }
+        )
+        shutil.rmtree(str(staged_path), ignore_errors=True)
+        if not copy_result:
             Log.a().warning(
                 'cannot copy app assets from %s to %s',
                 parsed_assets_uri['chopped_uri'],
@@ -411,71 +462,22 @@ class AppInstaller:
             )
             return False
 
-        # upload test script
-        parsed_test_uri = URIParser.parse(
-            '{}/{}'.format(
-                parsed_app_uri['chopped_uri'],
-                'test'
-            )
-        )
-        Log.some().info(
-            'creating test uri: %s', parsed_test_uri['chopped_uri']
-        )
-        if not DataManager.mkdir(
-                parsed_uri=parsed_test_uri,
-                recursive=True,
-                agave={
-                    'agave_wrapper': agave_wrapper
-                }
-        ):
-            Log.a().warning(
-                'cannot create test uri: %s', parsed_test_uri['chopped_uri']
-            )
-            return False
-
-        parsed_local_test_script = URIParser.parse(
-            str(self._path / 'test' / 'test.sh')
-        )
-        parsed_agave_test_script = URIParser.parse(
-            '{}/{}'.format(parsed_test_uri['chopped_uri'], 'test.sh')
-        )
-        Log.some().info(
-            'copying test script from %s to %s',
-            parsed_local_test_script['chopped_uri'],
-            parsed_agave_test_script['chopped_uri']
-        )
-        if not DataManager.copy(
-                parsed_src_uri=parsed_local_test_script,
-                parsed_dest_uri=parsed_agave_test_script,
-                local={},
-                agave={
-                    'agave_wrapper': agave_wrapper
-                }
-        ):
-            Log.a().warning(
-                'cannot copy test script from %s to %s',
-                parsed_local_test_script['chopped_uri'],
-                parsed_agave_test_script['chopped_uri']
-            )
-            return False
-
         # update existing app, or register new app
         Log.some().info('registering agave app')
 
-        app_definition = self._yaml_to_dict(
-            str(self._path / 'agave-app-def.json')
-        )
-        if not app_definition:
+        try:
+            app_definition = json.loads(app_definition_json)
+        except ValueError as err:
             Log.a().warning(
-                'cannot load agave app definition: %s',
-                str(self._path / 'agave-app-def.json')
+                'cannot load agave app definition: %s [%s]',
+                str(self._path / 'agave-app-def.json'), str(err)
             )
             return False
 
         app_add_result = agave_wrapper.apps_add_update(app_definition)
         if not app_add_result:
             Log.a().warning(
-                'cannot register agave app:\n%s', pprint.pformat(app_definition)
+                'cannot register agave app:\n%s', LazyFormat(app_definition)
             )
             return False
 
@@ -1,24 +1,62 @@
 """Module containing common functions for CLI sub-commands."""
 
 
+import os
+import stat
+
 from geneflow.log import Log
-from geneflow.workflow import Workflow
 
 
-def run_workflow(job, config, log_level):
+# config and log level of a worker process, set once by init_worker
+_WORKER_CONFIG = None
+_WORKER_LOG_LEVEL = None
+
+
+def init_worker(config, log_level):
+    """
+    Initialize a workflow worker process.
+
+    Used as a process pool initializer, so the config is sent to each worker
+    once rather than with every job.
+
+    Args:
+        config: GeneFlow configuration dict.
+        log_level: logging level for runs in this worker.
+
+    Returns:
+        None.
+
+    """
+    global _WORKER_CONFIG, _WORKER_LOG_LEVEL
+    _WORKER_CONFIG = config
+    _WORKER_LOG_LEVEL = log_level
+
+
+def run_workflow(job, config=None, log_level=None):
     """
     Run a GeneFlow workflow.
 
     Args:
         job: job dict describing run.
-        config: GeneFlow configuration dict.
-        log_level: logging level for this run.
+        config: GeneFlow configuration dict, defaults to the worker config
+            set by init_worker.
+        log_level: logging level for this run, defaults to the worker log
+            level set by init_worker.
 
     Returns:
         On success: Workflow job dict.
         On failure: False.
 
     """
+    # imported here so that CLI commands that only resolve paths don't load
+    # the workflow engine
+    from geneflow.workflow import Workflow
+
+    if config is None:
+        config = _WORKER_CONFIG
+    if log_level is None:
+        log_level = _WORKER_LOG_LEVEL
+
     if job['log']:
         # reconfig log location for this run
         Log.config(log_level, job['log'])
@@ -39,3 +77,57 @@ def run_workflow(job, config, log_level):
     Log.some().info('workflow complete:\n%s', str(workflow))
 
     return workflow.get_job()
+
+
+def _stat_or_none(path):
+    """Stat a path, returning None if it doesn't exist or can't be read."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def resolve_workflow_path(workflow_identifier):
+    """
+    Search GENEFLOW_PATH env var to find workflow definition.
+
+    Args:
+        workflow_identifier: workflow identifier
+
+    Returns:
+        On success: Full path of workflow yaml file (str).
+        On failure: False.
+
+    """
+    # check if abs path or in current directory first (.)
+    abs_path = os.path.abspath(workflow_identifier)
+    abs_stat = _stat_or_none(abs_path)
+    if abs_stat:
+        if stat.S_ISREG(abs_stat.st_mode):
+            return abs_path
+
+        if stat.S_ISDIR(abs_stat.st_mode): # assume this is the name of workflow package dir
+            yaml_path = os.path.join(abs_path, 'workflow.yaml')
+            yaml_stat = _stat_or_none(yaml_path)
+            if yaml_stat and stat.S_ISREG(yaml_stat.st_mode):
+                return yaml_path
+
+    # search GENEFLOW_PATH
+    gf_path = os.environ.get('GENEFLOW_PATH')
+
+    if gf_path:
+        for path in gf_path.split(':'):
+            if path:
+                # stat the workflow yaml directly, a missing package dir
+                # fails the same way
+                yaml_path = os.path.join(
+                    path, workflow_identifier, 'workflow.yaml'
+                )
+                yaml_stat = _stat_or_none(yaml_path)
+                if yaml_stat and stat.S_ISREG(yaml_stat.st_mode):
+                    return yaml_path
+
+    Log.an().error(
+        'workflow "%s" not found, check GENEFLOW_PATH', workflow_identifier
+    )
+    return False
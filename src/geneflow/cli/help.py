@@ -1,9 +1,9 @@
 """This module contains methods for the help CLI command."""
 
 
-import os
-from pathlib import Path
+import sys
 
+from geneflow.cli.common import resolve_workflow_path
 from geneflow.definition import Definition
 from geneflow.log import Log
 
@@ -21,47 +21,6 @@ def init_subparser(subparsers):
     return parser
 
 
-def resolve_workflow_path(workflow_identifier):
-    """
-    Search GENEFLOW_PATH env var to find workflow definition.
-
-    Args:
-        workflow_identifier: workflow identifier
-
-    Returns:
-        On success: Full path of workflow yaml file (str).
-        On failure: False.
-
-    """
-
-    # check if abs path or in current directory first (.)
-    abs_path = Path.absolute(Path(workflow_identifier))
-    if abs_path.is_file():
-        return str(abs_path)
-
-    if abs_path.is_dir(): # assume this is the name of workflow package dir
-        yaml_path = Path(abs_path / 'workflow.yaml')
-        if yaml_path.is_file():
-            return str(yaml_path)
-
-    # search GENEFLOW_PATH
-    gf_path = os.environ.get('GENEFLOW_PATH')
-
-    if gf_path:
-        for path in gf_path.split(':'):
-            if path:
-                wf_path = Path(path) / workflow_identifier
-                if wf_path.is_dir():
-                    yaml_path = Path(wf_path / 'workflow.yaml')
-                    if yaml_path.is_file():
-                        return str(yaml_path)
-
-    Log.an().error(
-        'workflow "%s" not found, check GENEFLOW_PATH', workflow_identifier
-    )
-    return False
-
-
 def help_func(args, other_args, subparser=None):
     """
     GeneFlow workflow help.
@@ -90,68 +49,63 @@ def help_func(args, other_args, subparser=None):
 
     # get first workflow dict
     workflow_dict = next(iter(gf_def.workflows().values()))
-    print()
-    print('{}: {}'.format(workflow_dict['name'], workflow_dict['description']))
-    print()
-    print('Execution Command:')
-    print('\tgf [--log-level LOG_LEVEL] [--log-file LOG_FILE] run WORKFLOW_PATH')
-    print('\t\t-o OUTPUT [-n NAME] [INPUTS] [PARAMETERS] [-w WORK_DIR [WORK_DIR ...]]')
-    print('\t\t[--ec CONTEXT [CONTEXT ...]] [--em METHOD [METHOD ...]] [--ep PARAM [PARAM ...]]')
-    print()
-    print('\tWORKFLOW_PATH: Path to directory that contains workflow definition')
-    print()
-    print('Job Configuration:')
-    print('\t-o,--output: Output directory')
-    print('\t-n,--name: Job name, a directory with this name will be created in the output directory')
-    print('\t\tdefault: geneflow-job')
-    print('\t-w,--work: Work directories, for temporary or intermediate data')
-    print('\t\tdefault: ~/.geneflow/work')
-    print('\t--no-output-hash: Flag indicating that the output directory should NOT include a random hash')
-    print('\t\tdefault: not set, output will include random hash')
-    print()
-    print('Inputs: Workflow-Specific Files or Folders')
-    for input_key in workflow_dict['inputs']:
-        print(
-            '\t--in.{}: {}: {}'.format(
-                input_key,
-                workflow_dict['inputs'][input_key]['label'],
-                workflow_dict['inputs'][input_key]['description']
-            )
-        )
-        print(
-            '\t\ttype: {}, default: {}'.format(
-                workflow_dict['inputs'][input_key]['type'],
-                workflow_dict['inputs'][input_key]['default']
-            )
-        )
-    print()
-    print('Parameters: Workflow-Specific Values')
-    for param_key in workflow_dict['parameters']:
-        print(
-            '\t--param.{}: {}: {}'.format(
-                param_key,
-                workflow_dict['parameters'][param_key]['label'],
-                workflow_dict['parameters'][param_key]['description']
-            )
-        )
-        print(
-            '\t\ttype: {}, default: {}'.format(
-                workflow_dict['parameters'][param_key]['type'],
-                workflow_dict['parameters'][param_key]['default']
-            )
-        )
-    print()
-    print('Execution Configuration:')
-    print('\t--ec,--exec-context: Execution contexts, e.g., local, agave, gridengine.')
-    print('\t\tThese can be specified for all workflow steps with "default:[CONTEXT]"')
-    print('\t\tor for specific steps with "step-name:[CONTEXT]".')
-    print('\t--em,--exec-method: Exeuction methods, e.g., singularity, docker, environment.')
-    print('\t\tThese can be specified for all workflow steps with "default:[METHOD]"')
-    print('\t\tor for specific steps with "step-name:[METHOD]". By default each app associated')
-    print('\t\twith a workflow step tries to automatically detect the execution method.')
-    print('\t--ep,--exec-param: Execution parameters, e.g., slots, mem, or other.')
-    print('\t\tThese can be specified for all workflow steps with "default.slots:[VALUE]"')
-    print('\t\tor for specific steps with "step-name.slots:[VALUE]". Execution parameters')
-    print('\t\tdepend on the execution context.')
+
+    # build help text and write it all at once
+    lines = [
+        '',
+        '{}: {}'.format(workflow_dict['name'], workflow_dict['description']),
+        '',
+        'Execution Command:',
+        '\tgf [--log-level LOG_LEVEL] [--log-file LOG_FILE] run WORKFLOW_PATH',
+        '\t\t-o OUTPUT [-n NAME] [INPUTS] [PARAMETERS] [-w WORK_DIR [WORK_DIR ...]]',
+        '\t\t[--ec CONTEXT [CONTEXT ...]] [--em METHOD [METHOD ...]] [--ep PARAM [PARAM ...]]',
+        '',
+        '\tWORKFLOW_PATH: Path to directory that contains workflow definition',
+        '',
+        'Job Configuration:',
+        '\t-o,--output: Output directory',
+        '\t-n,--name: Job name, a directory with this name will be created in the output directory',
+        '\t\tdefault: geneflow-job',
+        '\t-w,--work: Work directories, for temporary or intermediate data',
+        '\t\tdefault: ~/.geneflow/work',
+        '\t--no-output-hash: Flag indicating that the output directory should NOT include a random hash',
+        '\t\tdefault: not set, output will include random hash',
+        '',
+        'Inputs: Workflow-Specific Files or Folders'
+    ]
+    for input_key, input_def in workflow_dict['inputs'].items():
+        lines.append('\t--in.{}: {}: {}'.format(
+            input_key, input_def['label'], input_def['description']
+        ))
+        lines.append('\t\ttype: {}, default: {}'.format(
+            input_def['type'], input_def['default']
+        ))
+    lines += [
+        '',
+        'Parameters: Workflow-Specific Values'
+    ]
+    for param_key, param_def in workflow_dict['parameters'].items():
+        lines.append('\t--param.{}: {}: {}'.format(
+            param_key, param_def['label'], param_def['description']
+        ))
+        lines.append('\t\ttype: {}, default: {}'.format(
+            param_def['type'], param_def['default']
+        ))
+    lines += [
+        '',
+        'Execution Configuration:',
+        '\t--ec,--exec-context: Execution contexts, e.g., local, agave, gridengine.',
+        '\t\tThese can be specified for all workflow steps with "default:[CONTEXT]"',
+        '\t\tor for specific steps with "step-name:[CONTEXT]".',
+        '\t--em,--exec-method: Exeuction methods, e.g., singularity, docker, environment.',
+        '\t\tThese can be specified for all workflow steps with "default:[METHOD]"',
+        '\t\tor for specific steps with "step-name:[METHOD]". By default each app associated',
+        '\t\twith a workflow step tries to automatically detect the execution method.',
+        '\t--ep,--exec-param: Execution parameters, e.g., slots, mem, or other.',
+        '\t\tThese can be specified for all workflow steps with "default.slots:[VALUE]"',
+        '\t\tor for specific steps with "step-name.slots:[VALUE]". Execution parameters',
+        '\t\tdepend on the execution context.'
+    ]
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     return True
@@ -5,6 +5,7 @@ from pathlib import Path
 import yaml
 
 from geneflow.config import Config
+from geneflow import yaml_io
 from geneflow.log import Log
 from geneflow.workflow_installer import WorkflowInstaller
 
@@ -69,6 +70,13 @@ def init_subparser(subparsers):
         help='Auto-generate app files during install'
     )
     parser.set_defaults(make_apps=False)
+    parser.add_argument(
+        '--partial-clone', action='store_true',
+        required=False,
+        dest='partial_clone',
+        help='Defer download of app repo file contents until needed'
+    )
+    parser.set_defaults(partial_clone=False)
     parser.add_argument(
         '--config',
         type=str,
@@ -206,8 +214,8 @@ def install_workflow(args, other_args, subparser=None):
     agave_params = {}
     if args.agave_params:
         try:
-            with open(args.agave_params, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
+            with open(args.agave_params, 'rb') as yaml_file:
+                agave_params = yaml_io.safe_load(yaml_file)
         except IOError as err:
             Log.an().error(
                 'cannot read agave params file: %s [%s]',
@@ -215,12 +223,9 @@ def install_workflow(args, other_args, subparser=None):
                 str(err)
             )
             return False
-
-        try:
-            agave_params = yaml.safe_load(yaml_data)
         except yaml.YAMLError as err:
             Log.an().error(
-                'invalid yaml: %s [%s]', yaml_data, str(err)
+                'invalid yaml: %s [%s]', args.agave_params, str(err)
             )
             return False
 
@@ -252,7 +257,8 @@ def install_workflow(args, other_args, subparser=None):
         agave_username=args.agave_username,
         agave_domain=args.agave_domain,
         agave_publish=args.agave_publish,
-        make_apps=args.make_apps
+        make_apps=args.make_apps,
+        partial_clone=args.partial_clone
     )
 
     if not wf_installer.initialize():
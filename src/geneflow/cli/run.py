@@ -2,24 +2,12 @@
 
 
 import os
-import sys
 import argparse
-from itertools import chain
 from pathlib import Path
 from multiprocessing import Pool
-from functools import partial
 
-try:
-    from gooey import Gooey, GooeyParser
-except ImportError: pass
-
-import geneflow.cli.common
-from geneflow.config import Config
-from geneflow.definition import Definition
-from geneflow.environment import Environment
+from geneflow.cli.common import resolve_workflow_path
 from geneflow.log import Log
-from geneflow.data import DataSource, DataSourceException
-from geneflow.uri_parser import URIParser
 
 
 def init_subparser(subparsers):
@@ -36,67 +24,173 @@ def init_subparser(subparsers):
         default=False,
         help='Use a GUI argument parser'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        default=False,
+        dest='no_cache',
+        help='Do not cache parsed definition files'
+    )
+    parser.add_argument(
+        '--strict-validate',
+        action='store_true',
+        default=False,
+        dest='strict_validate',
+        help='Read the workflow definition back from the database to validate it'
+    )
     parser.set_defaults(func=run)
 
     return parser
 
 
-def resolve_workflow_path(workflow_identifier):
+def set_dict_key_list(dict_obj, keys, val):
+    """Update a dict based on given hierarchy of keys and val."""
+    for key in keys[:-1]:
+        dict_obj = dict_obj.setdefault(key, {})
+    dict_obj[keys[-1]] = val
+
+
+def apply_job_modifiers(jobs_dict, job_mods):
+    """Update the jobs_dict with the given modifiers."""
+    # split keys at . once for all jobs
+    split_mods = [(key.split('.'), val) for key, val in job_mods.items()]
+
+    # apply to all jobs
+    for job in jobs_dict.values():
+        for keys, val in split_mods:
+            set_dict_key_list(job, keys, val)
+
+
+def expand_uri(uri, expanded_uris):
     """
-    Search GENEFLOW_PATH env var to find workflow definition.
+    Expand a URI to an absolute path if local.
+
+    Results are stored in the expanded_uris dict, so each unique URI is only
+    parsed and resolved once.
 
     Args:
-        workflow_identifier: workflow identifier
+        uri: URI to expand.
+        expanded_uris: dict of previously expanded URIs.
 
     Returns:
-        On success: Full path of workflow yaml file (str).
+        On success: expanded URI, unchanged if not local.
         On failure: False.
 
     """
-    # check if abs path or in current directory first (.)
-    abs_path = Path.absolute(Path(workflow_identifier))
-    if abs_path.is_file():
-        return str(abs_path)
-
-    if abs_path.is_dir(): # assume this is the name of workflow package dir
-        yaml_path = Path(abs_path / 'workflow.yaml')
-        if yaml_path.is_file():
-            return str(yaml_path)
-
-    # search GENEFLOW_PATH
-    gf_path = os.environ.get('GENEFLOW_PATH')
-
-    if gf_path:
-        for path in gf_path.split(':'):
-            if path:
-                wf_path = Path(path) / workflow_identifier
-                if wf_path.is_dir():
-                    yaml_path = Path(wf_path / 'workflow.yaml')
-                    if yaml_path.is_file():
-                        return str(yaml_path)
-
-    Log.an().error(
-        'workflow "%s" not found, check GENEFLOW_PATH', workflow_identifier
-    )
-    return False
+    if uri in expanded_uris:
+        return expanded_uris[uri]
 
+    from geneflow.uri_parser import URIParser
 
-def set_dict_key_list(dict_obj, keys, val):
-    """Update a dict based on given hierarchy of keys and val."""
-    for key in keys[:-1]:
-        dict_obj = dict_obj.setdefault(key, {})
-    dict_obj[keys[-1]] = val
+    parsed_uri = URIParser.parse(uri)
+    if not parsed_uri:
+        return False
 
+    expanded_uri = uri
+    # expand relative path if local
+    if parsed_uri['scheme'] == 'local':
+        expanded_uri = os.path.realpath(
+            os.path.expanduser(parsed_uri['chopped_path'])
+        )
 
-def apply_job_modifiers(jobs_dict, job_mods):
-    """Update the jobs_dict with the given modifiers."""
-    for key in job_mods:
-        # split key at .
-        keys = key.split('.')
+    expanded_uris[uri] = expanded_uri
+
+    return expanded_uri
+
+
+def _build_dynamic_parser(workflow_dict):
+    """
+    Build the argument parser for dynamic args of a workflow.
+
+    Args:
+        workflow_dict: Workflow dictionary.
+
+    Returns:
+        argparse.ArgumentParser object.
+
+    """
+    # parse dynamic args. these are determined from workflow definition
+    dynamic_parser = argparse.ArgumentParser()
+
+    dynamic_parser.add_argument(
+        '-j', '--job',
+        type=str,
+        default=None,
+        dest='job_path',
+        help='Job Definition(s)'
+    )
+    for input_key in workflow_dict['inputs']:
+        dynamic_parser.add_argument(
+            '--in.{}'.format(input_key),
+            nargs='+',
+            type=str,
+            dest='inputs.{}'.format(input_key),
+            required=False,
+            default=workflow_dict['inputs'][input_key]['default'] \
+                if isinstance(workflow_dict['inputs'][input_key]['default'], list) \
+                else [workflow_dict['inputs'][input_key]['default']],
+            help=workflow_dict['inputs'][input_key]['label']
+        )
+    for param_key in workflow_dict['parameters']:
+        dynamic_parser.add_argument(
+            '--param.{}'.format(param_key),
+            dest='parameters.{}'.format(param_key),
+            required=False,
+            default=workflow_dict['parameters'][param_key]['default'],
+            help=workflow_dict['parameters'][param_key]['label']
+        )
+    dynamic_parser.add_argument(
+        '-o', '--output',
+        type=str,
+        default='~/geneflow-output',
+        help='Output Folder'
+    )
+    dynamic_parser.add_argument(
+        '-n', '--name',
+        type=str,
+        default='geneflow-job',
+        help='Name of Job'
+    )
+    dynamic_parser.add_argument(
+        '-w', '--work',
+        nargs='+',
+        type=str,
+        default=[],
+        help='Work Directory'
+    )
+    dynamic_parser.add_argument(
+        '--no-output-hash',
+        default=False,
+        action='store_true',
+        dest='no_output_hash',
+        help='No random hash for output directory'
+    )
+    dynamic_parser.add_argument(
+        '--exec-context', '--ec',
+        nargs='+',
+        type=str,
+        dest='exec_context',
+        default=[],
+        help='Execution Contexts'
+    )
+    dynamic_parser.add_argument(
+        '--exec-method', '--em',
+        nargs='+',
+        type=str,
+        dest='exec_method',
+        default=[],
+        help='Execution Methods'
+    )
+    dynamic_parser.add_argument(
+        '--exec-param', '--ep',
+        nargs='+',
+        type=str,
+        dest='exec_param',
+        default=[],
+        help='Execution Parameters'
+    )
 
-        # apply to all jobs
-        for job in jobs_dict.values():
-            set_dict_key_list(job, keys, job_mods[key])
+    return dynamic_parser
 
 
 def run(args, other_args, subparser):
@@ -112,6 +206,18 @@ def run(args, other_args, subparser):
         On failure: False.
 
     """
+    # import workflow engine modules only when running, so the CLI can
+    # initialize without them
+    import geneflow.cli.common
+    from geneflow.config import Config
+    from geneflow.definition import Definition
+    from geneflow.environment import Environment
+    from geneflow.data import DataSource, DataSourceException
+    from geneflow.uri_parser import URIParser
+
+    if args.no_cache:
+        Definition.cache_yaml = False
+
     # get absolute path to workflow
     workflow_path = resolve_workflow_path(args.workflow_path)
     if workflow_path:
@@ -155,16 +261,20 @@ def run(args, other_args, subparser):
             'workflow loaded: %s -> %s', workflow, defs['workflows'][workflow]
         )
 
-    # get workflow definition back from database to ensure
-    # that it's a valid definition
     workflow_id = next(iter(defs['workflows'].values()))
-    workflow_dict = data_source.get_workflow_def_by_id(workflow_id)
-    if not workflow_dict:
-        Log.an().error(
-            'cannot get workflow definition from data source: workflow_id=%s',
-            workflow_id
-        )
-        return False
+    if args.strict_validate:
+        # get workflow definition back from database to ensure
+        # that it's a valid definition
+        workflow_dict = data_source.get_workflow_def_by_id(workflow_id)
+        if not workflow_dict:
+            Log.an().error(
+                'cannot get workflow definition from data source: workflow_id=%s',
+                workflow_id
+            )
+            return False
+    else:
+        # use the validated definition that was just imported
+        workflow_dict = next(iter(defs['workflow_dicts'].values()))
 
     ### define arg parsing methods
     def parse_dynamic_args(workflow_dict):
@@ -182,92 +292,21 @@ def run(args, other_args, subparser):
             On failure: False.
 
         """
-        # parse dynamic args. these are determined from workflow definition
-        dynamic_parser = argparse.ArgumentParser()
-
-        dynamic_parser.add_argument(
-            '-j', '--job',
-            type=str,
-            default=None,
-            dest='job_path',
-            help='Job Definition(s)'
-        )
-        for input_key in workflow_dict['inputs']:
-            dynamic_parser.add_argument(
-                '--in.{}'.format(input_key),
-                nargs='+',
-                type=str,
-                dest='inputs.{}'.format(input_key),
-                required=False,
-                default=workflow_dict['inputs'][input_key]['default'] \
-                    if isinstance(workflow_dict['inputs'][input_key]['default'], list) \
-                    else [workflow_dict['inputs'][input_key]['default']],
-                help=workflow_dict['inputs'][input_key]['label']
-            )
-        for param_key in workflow_dict['parameters']:
-            dynamic_parser.add_argument(
-                '--param.{}'.format(param_key),
-                dest='parameters.{}'.format(param_key),
-                required=False,
-                default=workflow_dict['parameters'][param_key]['default'],
-                help=workflow_dict['parameters'][param_key]['label']
-            )
-        dynamic_parser.add_argument(
-            '-o', '--output',
-            type=str,
-            default='~/geneflow-output',
-            help='Output Folder'
-        )
-        dynamic_parser.add_argument(
-            '-n', '--name',
-            type=str,
-            default='geneflow-job',
-            help='Name of Job'
-        )
-        dynamic_parser.add_argument(
-            '-w', '--work',
-            nargs='+',
-            type=str,
-            default=[],
-            help='Work Directory'
-        )
-        dynamic_parser.add_argument(
-            '--no-output-hash',
-            default=False,
-            action='store_true',
-            dest='no_output_hash',
-            help='No random hash for output directory'
-        )
-        dynamic_parser.add_argument(
-            '--exec-context', '--ec',
-            nargs='+',
-            type=str,
-            dest='exec_context',
-            default=[],
-            help='Execution Contexts'
-        )
-        dynamic_parser.add_argument(
-            '--exec-method', '--em',
-            nargs='+',
-            type=str,
-            dest='exec_method',
-            default=[],
-            help='Execution Methods'
-        )
-        dynamic_parser.add_argument(
-            '--exec-param', '--ep',
-            nargs='+',
-            type=str,
-            dest='exec_param',
-            default=[],
-            help='Execution Parameters'
-        )
-
+        dynamic_parser = _build_dynamic_parser(workflow_dict)
         dynamic_args = dynamic_parser.parse_known_args(other_args)
 
         return dynamic_args[0]
 
-    if 'gooey' in sys.modules:
+    # gooey is optional, and only imported when a GUI parser is requested
+    use_gui = False
+    if args.gui:
+        try:
+            from gooey import Gooey, GooeyParser
+            use_gui = True
+        except ImportError:
+            Log.a().warning('gooey not installed, cannot use GUI parser')
+
+    if use_gui:
         @Gooey(
             program_name='GeneFlow: {}'.format(workflow_dict['name']),
             program_description=workflow_dict['description'],
@@ -388,7 +427,7 @@ def run(args, other_args, subparser):
             return dynamic_args
 
     # get dynamic args
-    if args.gui and 'gooey' in sys.modules:
+    if use_gui:
         dynamic_args = parse_dynamic_args_gui(workflow_dict)
     else:
         dynamic_args = parse_dynamic_args(workflow_dict)
@@ -418,123 +457,102 @@ def run(args, other_args, subparser):
             }
         }
 
-    # override with known cli parameters
-    apply_job_modifiers(
-        jobs_dict,
-        {
-            'name': dynamic_args.name,
-            'output_uri': dynamic_args.output,
-            'no_output_hash': dynamic_args.no_output_hash
-        }
-    )
-
     # insert workflow name into job, if not provided
     workflow_name = next(iter(defs['workflows']))
     for job in jobs_dict.values():
         if 'workflow_name' not in job:
             job['workflow_name'] = workflow_name
 
+    # override with known cli parameters, all modifiers are collected and
+    # applied to the jobs at once
+    job_mods = {
+        'name': dynamic_args.name,
+        'output_uri': dynamic_args.output,
+        'no_output_hash': dynamic_args.no_output_hash
+    }
+
     # add inputs and parameters to job definition
-    apply_job_modifiers(
-        jobs_dict,
-        {
-            dynamic_arg: getattr(dynamic_args, dynamic_arg)
-            for dynamic_arg in vars(dynamic_args) \
-                if dynamic_arg.startswith('inputs.') or dynamic_arg.startswith('parameters.')
-        }
-    )
+    for input_key in workflow_dict['inputs']:
+        dynamic_arg = 'inputs.{}'.format(input_key)
+        job_mods[dynamic_arg] = getattr(dynamic_args, dynamic_arg)
+    for param_key in workflow_dict['parameters']:
+        dynamic_arg = 'parameters.{}'.format(param_key)
+        job_mods[dynamic_arg] = getattr(dynamic_args, dynamic_arg)
 
     # add work URIs to job definition
-    work_uris = {}
     for work_arg in dynamic_args.work:
         parsed_work_uri = URIParser.parse(work_arg)
         if not parsed_work_uri:
             # skip if invalid URI
             Log.a().warning('invalid work uri: %s', work_arg)
         else:
-            work_uris[parsed_work_uri['scheme']] = parsed_work_uri['chopped_uri']
-
-    apply_job_modifiers(
-        jobs_dict,
-        {
-            'work_uri.{}'.format(context): work_uris[context]
-            for context in work_uris
-        }
-    )
+            job_mods['work_uri.{}'.format(parsed_work_uri['scheme'])] \
+                = parsed_work_uri['chopped_uri']
 
     # add execution options to job definition
-    ec_dict = {}
-    for exec_arg in dynamic_args.exec_context:
-        parts = exec_arg.split(':', 1)[0:2]
-        ec_dict['execution.context.{}'.format(parts[0])] = parts[1]
-    em_dict = {}
-    for exec_arg in dynamic_args.exec_method:
-        parts = exec_arg.split(':', 1)[0:2]
-        em_dict['execution.method.{}'.format(parts[0])] = parts[1]
-    ep_dict = {}
-    for exec_arg in dynamic_args.exec_param:
-        parts = exec_arg.split(':', 1)[0:2]
-        ep_dict['execution.parameters.{}'.format(parts[0])] = parts[1]
-
-    apply_job_modifiers(
-        jobs_dict,
-        dict(chain(ec_dict.items(), em_dict.items(), ep_dict.items()))
-    )
-
-    # get default values from workflow definition
+    for prefix, exec_args in (
+            ('execution.context.', dynamic_args.exec_context),
+            ('execution.method.', dynamic_args.exec_method),
+            ('execution.parameters.', dynamic_args.exec_param)
+    ):
+        for exec_arg in exec_args:
+            exec_key, sep, exec_val = exec_arg.partition(':')
+            if not sep:
+                # skip if not in key:value format
+                Log.a().warning('invalid execution option: %s', exec_arg)
+                continue
+            job_mods[prefix+exec_key] = exec_val
+
+    apply_job_modifiers(jobs_dict, job_mods)
+
+    # get default values from workflow definition, normalized once for
+    # all jobs
+    default_inputs = {}
+    for input_key in workflow_dict['inputs']:
+        default = workflow_dict['inputs'][input_key]['default']
+        default_inputs[input_key] \
+            = default if isinstance(default, list) else [default]
+    default_params = {
+        param_key: workflow_dict['parameters'][param_key]['default']
+        for param_key in workflow_dict['parameters']
+    }
     for job in jobs_dict.values():
-        if 'inputs' not in job:
-            job['inputs'] = {}
-        if 'parameters' not in job:
-            job['parameters'] = {}
-        for input_key in workflow_dict['inputs']:
-            if input_key not in job['inputs']:
-                job['inputs'][input_key]\
-                    = workflow_dict['inputs'][input_key]['default'] \
-                        if isinstance(workflow_dict['inputs'][input_key]['default'], list) \
-                        else [workflow_dict['inputs'][input_key]['default']]
-        for param_key in workflow_dict['parameters']:
-            if param_key not in job['parameters']:
-                job['parameters'][param_key]\
-                    = workflow_dict['parameters'][param_key]['default']
-
-    # expand URIs
+        job_inputs = job.setdefault('inputs', {})
+        job_params = job.setdefault('parameters', {})
+        for input_key in default_inputs:
+            if input_key not in job_inputs:
+                # copy, since input URIs of each job are expanded in place
+                job_inputs[input_key] = list(default_inputs[input_key])
+        for param_key in default_params:
+            job_params.setdefault(param_key, default_params[param_key])
+
+    # expand URIs, each unique URI is parsed and resolved only once, since
+    # default inputs are usually shared by all jobs
+    expanded_uris = {}
     for job in jobs_dict.values():
         # output URI
-        parsed_uri = URIParser.parse(job['output_uri'])
-        if not parsed_uri:
+        expanded_uri = expand_uri(job['output_uri'], expanded_uris)
+        if not expanded_uri:
             Log.an().error('invalid output uri: %s', job['output_uri'])
             return False
-        # expand relative path if local
-        if parsed_uri['scheme'] == 'local':
-            job['output_uri'] = str(
-                Path(parsed_uri['chopped_path']).expanduser().resolve()
-            )
+        job['output_uri'] = expanded_uri
         # work URIs
         for context in job['work_uri']:
-            parsed_uri = URIParser.parse(job['work_uri'][context])
-            if not parsed_uri:
+            expanded_uri = expand_uri(job['work_uri'][context], expanded_uris)
+            if not expanded_uri:
                 Log.an().error('invalid work uri: %s', job['work_uri'])
                 return False
-            # expand relative path if local
-            if parsed_uri['scheme'] == 'local':
-                job['work_uri'][context] = str(
-                    Path(parsed_uri['chopped_path']).expanduser().resolve()
-                )
+            job['work_uri'][context] = expanded_uri
         # input URIs
         for input_key in job['inputs']:
             for i, input_uri in enumerate(job['inputs'][input_key]):
-                parsed_uri = URIParser.parse(input_uri)
-                if not parsed_uri:
+                expanded_uri = expand_uri(input_uri, expanded_uris)
+                if not expanded_uri:
                     Log.an().error(
                         'invalid input uri: %s', input_uri
                     )
                     return False
-                # expand relative path if local
-                if parsed_uri['scheme'] == 'local':
-                    job['inputs'][input_key][i] = str(
-                        Path(parsed_uri['chopped_path']).expanduser().resolve()
-                    )
+                job['inputs'][input_key][i] = expanded_uri
 
     # import jobs into database
     job_ids = data_source.import_jobs_from_dict(jobs_dict)
@@ -544,7 +562,11 @@ def run(args, other_args, subparser):
     data_source.commit()
 
     # create process pool to run workflows in parallel
-    pool = Pool(min(5, len(job_ids)))
+    pool = Pool(
+        min(5, len(job_ids)),
+        initializer=geneflow.cli.common.init_worker,
+        initargs=(config_dict, args.log_level)
+    )
     jobs = [
         {
             'name': job,
@@ -553,14 +575,20 @@ def run(args, other_args, subparser):
         } for job in job_ids
     ]
 
-    result = pool.map(
-        partial(
-            geneflow.cli.common.run_workflow,
-            config=config_dict,
-            log_level=args.log_level
-        ),
-        jobs
-    )
+    # collect results as jobs finish, so free workers can immediately pick
+    # up the next job
+    result = []
+    for job_result in pool.imap_unordered(
+            geneflow.cli.common.run_workflow, jobs, chunksize=1
+    ):
+        result.append(job_result)
+        if job_result:
+            Log.some().info(
+                'job finished (%s of %s): %s',
+                len(result), len(jobs), job_result['name']
+            )
+        else:
+            Log.an().error('job failed (%s of %s)', len(result), len(jobs))
 
     pool.close()
     pool.join()
@@ -3,7 +3,6 @@
 
 from pathlib import Path
 from multiprocessing import Pool
-from functools import partial
 import pprint
 
 import geneflow.cli.common
@@ -99,7 +98,11 @@ def run_pending(args, other_args, subparser=None):
         data_source.commit()
 
     # create a thread pool to run at most 5 jobs concurrently
-    pool = Pool(min(5, len(pending_jobs)))
+    pool = Pool(
+        min(5, len(pending_jobs)),
+        initializer=geneflow.cli.common.init_worker,
+        initargs=(config_dict, args.log_level)
+    )
     jobs = [
         {
             'name': job['name'],
@@ -108,14 +111,7 @@ def run_pending(args, other_args, subparser=None):
         } for job in pending_jobs
     ]
 
-    result = pool.map(
-        partial(
-            geneflow.cli.common.run_workflow,
-            config=config_dict,
-            log_level=args.log_level
-        ),
-        jobs
-    )
+    result = pool.map(geneflow.cli.common.run_workflow, jobs)
     pool.close()
     pool.join()
 
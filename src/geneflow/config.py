@@ -4,6 +4,7 @@ import pprint
 import cerberus
 import yaml
 
+from geneflow import yaml_io
 from geneflow.log import Log
 
 GF_VERSION = 'v2.0'
@@ -22,6 +23,7 @@ CONFIG_MAIN_SCHEMA = {
 ENV_SCHEMA = {
     GF_VERSION: {
         'run_poll_delay': {'type': 'integer', 'default': 2},
+        'run_poll_max_delay': {'type': 'integer', 'default': 30},
         'database': {
             'type': 'dict',
             'default': {
@@ -34,6 +36,13 @@ ENV_SCHEMA = {
             'default': {
                 'connection_type': 'agave-cli'
             }
+        },
+        'gridengine': {
+            'type': 'dict',
+            'default': {
+                'join_files': False,
+                'qstat_status': False
+            }
         }
     }
 }
@@ -42,14 +51,19 @@ DATABASE_SCHEMA = {
     GF_VERSION: {
         'sqlite': {
             'type': {'type': 'string', 'required': True, 'allowed': ['sqlite']},
-            'path': {'type': 'string', 'required': True}
+            'path': {'type': 'string', 'required': True},
+            'pool_size': {'type': 'integer', 'min': 1},
+            'pool_timeout': {'type': 'integer', 'min': 0},
+            'wal': {'type': 'boolean', 'default': False}
         },
         'mysql': {
             'type': {'type': 'string', 'required': True, 'allowed': ['mysql']},
             'host': {'type': 'string', 'required': True},
             'database': {'type': 'string', 'required': True},
             'user': {'type': 'string', 'required': True},
-            'password': {'type': 'string', 'required': True}
+            'password': {'type': 'string', 'required': True},
+            'pool_size': {'type': 'integer', 'min': 1},
+            'pool_timeout': {'type': 'integer', 'min': 0}
         }
     }
 }
@@ -149,16 +163,13 @@ class Config:
 
         """
         try:
-            with open(config_file, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
+            with open(config_file, 'rb') as yaml_file:
+                yaml_dict = yaml_io.safe_load(yaml_file)
         except IOError as err:
             Log.an().error(
                 'cannot read yaml file: %s [%s]', config_file, str(err)
             )
             return False
-
-        try:
-            yaml_dict = yaml.safe_load(yaml_data)
         except yaml.YAMLError as err:
             Log.an().error('invalid yaml: %s [%s]', config_file, str(err))
             return False
@@ -11,10 +11,11 @@ import os
 import uuid
 import yaml
 
-from sqlalchemy import create_engine, asc, desc, case
+from sqlalchemy import create_engine, asc, desc, case, event
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
 from geneflow.definition import Definition
@@ -25,6 +26,19 @@ from geneflow.log import Log
 Base = declarative_base()
 Session = sessionmaker()
 
+# database engines, shared by all DataSource instances of a process
+_ENGINES = {}
+
+# pragmas set on each new SQLite connection if enabled with the "wal" database
+# option. WAL journaling with normal synchronization needs far fewer fsyncs per
+# transaction than the default rollback journal, but doesn't work on network
+# file systems and may lose the last transactions on power loss.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY'
+]
+
 
 #### SQLAlchemy table definitions
 
@@ -168,35 +182,89 @@ class DataSource:
         """
         self._db_conf = db_conf
         if db_conf['type'] == 'mysql':
-            try:
-                self._engine = create_engine(
-                    'mysql+pymysql://{}:{}@{}/{}'.format(
-                        db_conf['user'],
-                        db_conf['password'],
-                        db_conf['host'],
-                        db_conf['database']
-                    )
-                )
-            except SQLAlchemyError as err:
-                Log.an().error('sql exception [%s]', str(err))
-                raise DataSourceException('DataSource() init failed')
+            db_url = 'mysql+pymysql://{}:{}@{}/{}'.format(
+                db_conf['user'],
+                db_conf['password'],
+                db_conf['host'],
+                db_conf['database']
+            )
 
         elif db_conf['type'] == 'sqlite':
-            try:
-                self._engine = create_engine('sqlite:///{}'.format(
-                    db_conf['path']
-                ))
-            except SQLAlchemyError as err:
-                Log.an().error('sql exception [%s]', str(err))
-                raise DataSourceException('DataSource() init failed')
+            db_url = 'sqlite:///{}'.format(db_conf['path'])
 
         else:
             Log.an().error('invalid db type: %s', db_conf['type'])
             raise DataSourceException('DataSource() init failed')
 
+        try:
+            self._engine = self._get_engine(db_url, db_conf)
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            raise DataSourceException('DataSource() init failed')
+
         self._session = Session(bind=self._engine)
 
 
+    @classmethod
+    def _get_engine(cls, db_url, db_conf):
+        """
+        Get the database engine of the current process for a database URL.
+
+        Engines and their connection pools are shared by all DataSource
+        instances of a process. The optional pool_size and pool_timeout
+        database config keys size the connection pool.
+
+        Args:
+            db_url: SQLAlchemy database URL.
+            db_conf: database configuration dict.
+
+        Returns:
+            SQLAlchemy engine.
+
+        """
+        # key by process ID, so forked workers don't reuse their parent's
+        # connections
+        engine_key = (db_url, os.getpid())
+        if engine_key not in _ENGINES:
+            engine_args = {}
+            if 'pool_size' in db_conf or 'pool_timeout' in db_conf:
+                engine_args['poolclass'] = QueuePool
+                if 'pool_size' in db_conf:
+                    engine_args['pool_size'] = db_conf['pool_size']
+                if 'pool_timeout' in db_conf:
+                    engine_args['pool_timeout'] = db_conf['pool_timeout']
+                if db_conf['type'] == 'sqlite':
+                    # pooled connections may be checked out by any thread
+                    engine_args['connect_args'] = {'check_same_thread': False}
+
+            engine = create_engine(db_url, **engine_args)
+            if db_conf['type'] == 'sqlite' and db_conf.get('wal', False):
+                event.listen(engine, 'connect', cls._set_sqlite_pragmas)
+
+            _ENGINES[engine_key] = engine
+
+        return _ENGINES[engine_key]
+
+
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Set pragmas on a new SQLite connection.
+
+        Args:
+            dbapi_connection: DBAPI connection.
+            connection_record: connection pool record, unused.
+
+        Returns:
+            None.
+
+        """
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
     def commit(self):
         """
         Commit current transaction to the database and closes the session.
@@ -1238,23 +1306,6 @@ class DataSource:
             On failure: False.
 
         """
-        def merge_dicts(dict_a, dict_b):
-            """
-            Merge two dictionaries (for Python versions 3.4 or lower).
-
-            Args:
-                dict_a: First dictionary.
-                dict_b: Second dictionary.
-
-            Returns:
-                On success: return a new dict merging the two dicts.
-                On failure: False.
-
-            """
-            dict_c = dict_a.copy()
-            dict_c.update(dict_b)
-            return dict_c
-
         try:
             query = self._session.query(
                 JobEntity, WorkflowEntity.name
@@ -1272,10 +1323,8 @@ class DataSource:
 
             # convert result tuple to dict
             result_dict = [
-                merge_dicts(
-                    row[0].__dict__,
-                    {'workflow_name': row[1]}
-                ) for row in result
+                {**row[0].__dict__, 'workflow_name': row[1]}
+                for row in result
             ]
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
@@ -1611,11 +1660,13 @@ class DataSource:
             def_path: path to geneflow definition.
 
         Returns:
-            On success: Dict mapping names to IDs:
+            On success: Dict mapping names to IDs, and workflow names to
+                validated workflow dicts:
                 {
                     'apps': {'app1': 'id', 'app2': 'id', ...},
                     'workflows': {'workflow1': 'id', 'workflow2': 'id', ...},
-                    'jobs': {'job1': 'id', 'job2', 'id', ...}
+                    'jobs': {'job1': 'id', 'job2', 'id', ...},
+                    'workflow_dicts': {'workflow1': {...}, ...}
                 }
             On failure: False.
 
@@ -1641,7 +1692,8 @@ class DataSource:
         return {
             'apps': app_name2id,
             'workflows': workflow_name2id,
-            'jobs': job_name2id
+            'jobs': job_name2id,
+            'workflow_dicts': gf_def.workflows()
         }
 
 
@@ -2467,6 +2519,8 @@ class DataSource:
 
         """
         job_name2id = {}
+        # steps of each workflow, queried once for all jobs of the workflow
+        workflow_steps = {}
         for job in iter(jobs_dict.values()):
 
             valid_def = {}
@@ -2513,7 +2567,10 @@ class DataSource:
             valid_def['job_id'] = job_id
 
             # insert job step records
-            steps = self.get_step_by_workflow_id(valid_def['workflow_id'])
+            if valid_def['workflow_id'] not in workflow_steps:
+                workflow_steps[valid_def['workflow_id']] \
+                    = self.get_step_by_workflow_id(valid_def['workflow_id'])
+            steps = workflow_steps[valid_def['workflow_id']]
             if not steps:
                 Log.an().error(
                     'cannot get steps for workflow: workflow_id=%s',
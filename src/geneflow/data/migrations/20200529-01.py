@@ -2,21 +2,33 @@
 
 from yoyo import step
 
+# each table is altered with a single statement, and new columns are filled
+# with a single update, so each table is only rebuilt and scanned once
+
 # workflow table
-step("ALTER TABLE workflow CHANGE repo_uri git TEXT NOT NULL")
-step("ALTER TABLE workflow DROP documentation_uri")
-step("ALTER TABLE workflow ADD COLUMN apps TEXT NOT NULL")
+step(
+    "ALTER TABLE workflow"
+    " CHANGE repo_uri git TEXT NOT NULL,"
+    " DROP documentation_uri,"
+    " ADD COLUMN apps TEXT NOT NULL"
+)
 step("UPDATE workflow SET apps = '{}' WHERE apps = ''")
 
 # app table
-step("ALTER TABLE app CHANGE repo_uri git TEXT NOT NULL")
-step("ALTER TABLE app CHANGE definition implementation TEXT NOT NULL")
-step("ALTER TABLE app ADD COLUMN pre_exec TEXT NOT NULL")
-step("UPDATE app SET pre_exec = '[]' WHERE pre_exec = ''")
-step("ALTER TABLE app ADD COLUMN exec_methods TEXT NOT NULL")
-step("UPDATE app SET exec_methods = '[]' WHERE exec_methods = ''")
-step("ALTER TABLE app ADD COLUMN post_exec TEXT NOT NULL")
-step("UPDATE app SET post_exec = '[]' WHERE post_exec = ''")
+step(
+    "ALTER TABLE app"
+    " CHANGE repo_uri git TEXT NOT NULL,"
+    " CHANGE definition implementation TEXT NOT NULL,"
+    " ADD COLUMN pre_exec TEXT NOT NULL,"
+    " ADD COLUMN exec_methods TEXT NOT NULL,"
+    " ADD COLUMN post_exec TEXT NOT NULL"
+)
+step(
+    "UPDATE app SET"
+    " pre_exec = IF(pre_exec = '', '[]', pre_exec),"
+    " exec_methods = IF(exec_methods = '', '[]', exec_methods),"
+    " post_exec = IF(post_exec = '', '[]', post_exec)"
+)
 
 # step table
 step("ALTER TABLE step ADD COLUMN exec_parameters TEXT NOT NULL")
@@ -25,5 +37,3 @@ step("UPDATE step SET exec_parameters = '{}' WHERE exec_parameters = ''")
 # job table
 step("ALTER TABLE job ADD COLUMN exec_parameters TEXT NOT NULL")
 step("UPDATE job SET exec_parameters = '{}' WHERE exec_parameters = ''")
-
-
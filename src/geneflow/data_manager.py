@@ -131,6 +131,47 @@ class DataManager:
         return delete_func(parsed_uri, **kwargs)
 
 
+    @classmethod
+    def delete_if_exists(cls, uri=None, parsed_uri=None, **kwargs):
+        """
+        Delete URI if it exists.
+
+        Unlike a call to exists() followed by delete(), this is a single
+        call for remote contexts. URIs are parsed to extract contexts, and
+        the appropriate method is called. Either uri or parsed_uri may be
+        specified, but not both, if both are specified, parsed_uri is used.
+
+        Args:
+            uri: URI to delete.
+            parsed_uri: URI to delete, already parsed.
+            **kwargs: Other arguments specific to context.
+
+        Returns:
+            On success: True, also if the URI doesn't exist.
+            On failure: False.
+
+        """
+        # parse and validate URI
+        if not parsed_uri:
+            parsed_uri = URIParser.parse(uri)
+            if not parsed_uri:
+                Log.an().error('invalid uri: %s', uri)
+                return False
+
+        # check if the delete_if_exists method exists for context
+        try:
+            delete_func = getattr(cls, '_delete_if_exists_{}'\
+                .format(parsed_uri['scheme']))
+
+        except AttributeError:
+            Log.an().error(
+                '_delete_if_exists_%s method not defined', parsed_uri['scheme']
+            )
+            return False
+
+        return delete_func(parsed_uri, **kwargs)
+
+
     @classmethod
     def mkdir(cls, uri=None, parsed_uri=None, recursive=False, **kwargs):
 
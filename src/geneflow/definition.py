@@ -1,11 +1,15 @@
 """This module contains the GeneFlow Definition class."""
 
 import copy
+from functools import lru_cache
+import os
 import pprint
+import threading
 
 import cerberus
 import yaml
 
+from geneflow import yaml_io
 from geneflow.log import Log
 
 GF_VERSION = 'v2.0'
@@ -382,6 +386,13 @@ JOB_SCHEMA = {
     }
 }
 
+# schema validators are created once and reused. Validators keep the state
+# of the last validated document, so access is serialized.
+APP_VALIDATOR = cerberus.Validator(APP_SCHEMA[GF_VERSION])
+WORKFLOW_VALIDATOR = cerberus.Validator(WORKFLOW_SCHEMA[GF_VERSION])
+JOB_VALIDATOR = cerberus.Validator(JOB_SCHEMA[GF_VERSION])
+VALIDATOR_LOCK = threading.Lock()
+
 
 class Definition:
     """
@@ -391,6 +402,9 @@ class Definition:
     definition YAML file and job definition YAML file.
     """
 
+    # cache parsed yaml files, keyed by path, modification time, and size
+    cache_yaml = True
+
     def __init__(self):
         """Initialize Definition class with default values."""
         self._apps = {}
@@ -404,7 +418,8 @@ class Definition:
         Load a multi-doc yaml file.
 
         Read a multi-doc yaml file and return a list of dicts. Only basic YAML
-        validation is performed in this method.
+        validation is performed in this method. Parsed files are cached
+        unless cache_yaml is False, and a copy of the cached docs is returned.
 
         Args:
             yaml_path: path to multi-doc YAML file.
@@ -413,17 +428,46 @@ class Definition:
             List of dicts.
 
         """
+        if not cls.cache_yaml:
+            return cls._read_yaml(yaml_path)
+
         try:
-            with open(yaml_path, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
-        except IOError as err:
+            yaml_stat = os.stat(str(yaml_path))
+        except OSError as err:
             Log.an().error(
                 'cannot read yaml file: %s [%s]', yaml_path, str(err)
             )
             return False
 
+        yaml_dict = cls._read_yaml_cached(
+            os.path.abspath(str(yaml_path)),
+            yaml_stat.st_mtime_ns,
+            yaml_stat.st_size
+        )
+        if yaml_dict is False:
+            return False
+
+        return copy.deepcopy(yaml_dict)
+
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _read_yaml_cached(cls, yaml_path, mtime_ns, size):
+        """Read a multi-doc yaml file, cached by path, mtime, and size."""
+        return cls._read_yaml(yaml_path)
+
+
+    @classmethod
+    def _read_yaml(cls, yaml_path):
+        """Read a multi-doc yaml file and return a list of dicts."""
         try:
-            yaml_dict = list(yaml.safe_load_all(yaml_data))
+            with open(yaml_path, 'rb') as yaml_file:
+                yaml_dict = yaml_io.safe_load_all(yaml_file)
+        except IOError as err:
+            Log.an().error(
+                'cannot read yaml file: %s [%s]', yaml_path, str(err)
+            )
+            return False
         except yaml.YAMLError as err:
             Log.an().error('invalid yaml: %s [%s]', yaml_path, str(err))
             return False
@@ -515,13 +559,14 @@ class Definition:
     @classmethod
     def validate_app(cls, app_def):
         """Validate app definition."""
-        validator = cerberus.Validator(APP_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(app_def)
+        with VALIDATOR_LOCK:
+            valid_def = APP_VALIDATOR.validated(app_def)
+            errors = APP_VALIDATOR.errors
 
         if not valid_def:
             Log.an().error(
                 'app validation error:\n%s',
-                pprint.pformat(validator.errors)
+                pprint.pformat(errors)
             )
             return False
 
@@ -604,13 +649,14 @@ class Definition:
     @classmethod
     def validate_workflow(cls, workflow_def):
         """Validate workflow definition."""
-        validator = cerberus.Validator(WORKFLOW_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(workflow_def)
+        with VALIDATOR_LOCK:
+            valid_def = WORKFLOW_VALIDATOR.validated(workflow_def)
+            errors = WORKFLOW_VALIDATOR.errors
 
         if not valid_def:
             Log.an().error(
                 'workflow validation error:\n%s',
-                pprint.pformat(validator.errors)
+                pprint.pformat(errors)
             )
             return False
 
@@ -628,13 +674,14 @@ class Definition:
     @classmethod
     def validate_job(cls, job_def):
         """Validate job definition."""
-        validator = cerberus.Validator(JOB_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(job_def)
+        with VALIDATOR_LOCK:
+            valid_def = JOB_VALIDATOR.validated(job_def)
+            errors = JOB_VALIDATOR.errors
 
         if not valid_def:
             Log.an().error(
                 'job validation error: \n%s',
-                pprint.pformat(validator.errors)
+                pprint.pformat(errors)
             )
             return False
 
@@ -1,19 +1,49 @@
 """This module contains the GeneFlow AgaveStep class."""
 
 
-import pprint
-import regex as re
+from functools import lru_cache
+import re
 from slugify import slugify
 import urllib.parse
 from wcmatch import glob
 
-from geneflow.log import Log
+from geneflow.log import LazyFormat, Log
 from geneflow.data_manager import DataManager
 from geneflow.uri_parser import URIParser
 from geneflow.workflow_step import WorkflowStep
 from geneflow.extend.agave_wrapper import AgaveWrapper
 
 
+# max number of threads for concurrent agave calls of a step
+MAX_AGAVE_THREADS = 16
+
+# hpc job id in agave job history
+HPC_JOB_ID_REGEX = re.compile(r'^HPC.*local job (\d*)$')
+
+# agave log files, the pattern is gf-{}-{}-{}.out or .err
+AGAVE_LOG_REGEX = re.compile(r'^gf-\d*-.*\.(?:out|err)$')
+
+# characters not allowed in agave job names
+JOB_NAME_SLUG_PATTERN = r'[^-a-z0-9_]+'
+
+
+@lru_cache(maxsize=1024)
+def quote_input(value):
+    """Quote an agave job input value, cached since values often repeat."""
+    return urllib.parse.quote(value, safe='/:')
+
+
+@lru_cache(maxsize=4096)
+def job_name(attempt, slug_step_name, output):
+    """Build an agave job name, cached so retries don't re-slugify outputs."""
+    name = 'gf-{}-{}-{}'.format(
+        str(attempt),
+        slug_step_name,
+        slugify(output, regex_pattern=JOB_NAME_SLUG_PATTERN)
+    )
+    return name[:62]+'..' if len(name) > 64 else name
+
+
 class AgaveStep(WorkflowStep):
     """
     A class that represents Agave Workflow step objects. Inherits from the..
@@ -68,6 +98,21 @@ class AgaveStep(WorkflowStep):
         # agave context data
         self._agave = agave
 
+        # step name slug, used in all agave job names of the step
+        self._slug_step_name = slugify(
+            self._step['name'], regex_pattern=JOB_NAME_SLUG_PATTERN
+        )
+
+        # quoted default app inputs and non-empty default app parameters,
+        # set by initialize()
+        self._default_inputs = {}
+        self._default_params = {}
+
+        # archive uri components, set by initialize()
+        self._archive_chopped_uri = None
+        self._archive_chopped_path = None
+        self._archive_authority = None
+
 
     def initialize(self):
         """
@@ -94,6 +139,12 @@ class AgaveStep(WorkflowStep):
             Log.an().error(msg)
             return self._fatal(msg)
 
+        # archive uri components used by every agave job of the step
+        parsed_archive_uri = self._agave['parsed_archive_uri']
+        self._archive_chopped_uri = parsed_archive_uri['chopped_uri']
+        self._archive_chopped_path = parsed_archive_uri['chopped_path']
+        self._archive_authority = parsed_archive_uri['authority']
+
         # make sure the step context is agave
         if self._step['execution']['context'] != 'agave':
             msg = (
@@ -117,6 +168,22 @@ class AgaveStep(WorkflowStep):
             Log.an().error(msg)
             return self._fatal(msg)
 
+        # quote default app inputs once, only include an input if the value
+        # is a non-empty string
+        self._default_inputs = {
+            input_key: quote_input(str(self._app['inputs'][input_key]['default']))
+            for input_key in self._app['inputs']
+            if self._app['inputs'][input_key]['default']
+        }
+
+        # default app parameters, overwritten by template parameters of each
+        # map item
+        self._default_params = {
+            param_key: self._app['parameters'][param_key]['default']
+            for param_key in self._app['parameters']
+            if self._app['parameters'][param_key]['default'] not in (None, '')
+        }
+
         return True
 
 
@@ -132,54 +199,47 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
+        parsed_data_uri = self._parsed_data_uris[self._source_context][0]
+
         # make sure the source data URI has a compatible scheme (agave)
-        if self._parsed_data_uris[self._source_context][0]['scheme'] != 'agave':
+        if parsed_data_uri['scheme'] != 'agave':
             msg = 'invalid data uri scheme for this step: {}'.format(
-                self._parsed_data_uris[self._source_context][0]['scheme']
+                parsed_data_uri['scheme']
             )
             Log.an().error(msg)
             return self._fatal(msg)
 
         # delete folder if it already exists and clean==True
-        if (
-                DataManager.exists(
-                    parsed_uri=self._parsed_data_uris[self._source_context][0],
-                    agave=self._agave
-                )
-                and self._clean
-        ):
-            if not DataManager.delete(
-                    parsed_uri=self._parsed_data_uris[self._source_context][0],
+        if self._clean:
+            if not DataManager.delete_if_exists(
+                    parsed_uri=parsed_data_uri,
                     agave=self._agave
             ):
                 Log.a().warning(
                     'cannot delete existing data uri: %s',
-                    self._parsed_data_uris[self._source_context][0]['chopped_uri']
+                    parsed_data_uri['chopped_uri']
                 )
 
         # create folder
         if not DataManager.mkdir(
-                parsed_uri=self._parsed_data_uris[self._source_context][0],
+                parsed_uri=parsed_data_uri,
                 recursive=True,
                 agave=self._agave
         ):
             msg = 'cannot create data uri: {}'.format(
-                self._parsed_data_uris[self._source_context][0]['chopped_uri']
+                parsed_data_uri['chopped_uri']
             )
             Log.an().error(msg)
             return self._fatal(msg)
 
         # create _log folder
+        log_uri = '{}/_log'.format(parsed_data_uri['chopped_uri'])
         if not DataManager.mkdir(
-                uri='{}/_log'.format(
-                    self._parsed_data_uris[self._source_context][0]['chopped_uri']
-                ),
+                uri=log_uri,
                 recursive=True,
                 agave=self._agave
         ):
-            msg = 'cannot create _log folder in data uri: {}/_log'.format(
-                self._parsed_data_uris[self._source_context][0]['chopped_uri']
-            )
+            msg = 'cannot create _log folder in data uri: {}'.format(log_uri)
             Log.an().error(msg)
             return self._fatal(msg)
 
@@ -270,100 +330,140 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
-        # load default app inputs overwrite with template inputs
-        inputs = {}
-        for input_key in self._app['inputs']:
-            if input_key in map_item['template']:
-                if map_item['template'][input_key]:
-                    # only include an input if the value is a non-empty string
-                    inputs[input_key] = urllib.parse.quote(
-                        str(map_item['template'][input_key]),
-                        safe='/:'
-                    )
-            else:
-                if self._app['inputs'][input_key]['default']:
-                    # only include an input if the value is a non-empty string
-                    inputs[input_key] = urllib.parse.quote(
-                        str(self._app['inputs'][input_key]['default']),
-                        safe='/:'
-                    )
+        app_template = self._get_app_template(map_item)
+
+        return self._record_job(
+            map_item, app_template, self._submit_job(app_template)
+        )
+
+
+    def _get_app_template(self, map_item):
+        """
+        Construct the agave job template of a map item.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map).
+
+        Returns:
+            Agave job template dict.
+
+        """
+        # local aliases for lookups repeated below
+        template = map_item['template']
+        app_params = self._app['parameters']
+        exec_params = self._step['execution']['parameters']
+
+        # load default app inputs overwrite with template inputs, only
+        # include an input if the value is a non-empty string
+        inputs = {
+            input_key: (
+                quote_input(str(template[input_key]))
+                if input_key in template
+                else self._default_inputs[input_key]
+            )
+            for input_key in self._app['inputs']
+            if (
+                template[input_key] if input_key in template
+                else input_key in self._default_inputs
+            )
+        }
 
         # load default app parameters, overwrite with template parameters
-        parameters = {}
-        for param_key in self._app['parameters']:
-            if param_key in map_item['template']:
-                if self._app['parameters'][param_key]['type'] in ['int', 'long']:
-                    parameters[param_key] = int(map_item['template'][param_key])
-                elif self._app['parameters'][param_key]['type'] == ['float', 'double']:
-                    parameters[param_key] = float(map_item['template'][param_key])
+        parameters = dict(self._default_params)
+        for param_key, app_param in app_params.items():
+            if param_key in template:
+                if app_param['type'] in ['int', 'long']:
+                    parameters[param_key] = int(template[param_key])
+                elif app_param['type'] == ['float', 'double']:
+                    parameters[param_key] = float(template[param_key])
                 else:
-                    parameters[param_key] = str(map_item['template'][param_key])
-            else:
-                if self._app['parameters'][param_key]['default'] not in [None, '']:
-                    parameters[param_key] \
-                        = self._app['parameters'][param_key]['default']
+                    parameters[param_key] = str(template[param_key])
 
         # add execution method as parameter
         parameters['exec_method'] = self._step['execution']['method']
 
         # add execution init commands if 'init' param given
-        if 'init' in self._step['execution']['parameters']:
-            parameters['exec_init'] = self._step['execution']['parameters']['init']
+        if 'init' in exec_params:
+            parameters['exec_init'] = exec_params['init']
 
         # construct agave app template
-        name = 'gf-{}-{}-{}'.format(
-            str(map_item['attempt']),
-            slugify(self._step['name'], regex_pattern=r'[^-a-z0-9_]+'),
-            slugify(map_item['template']['output'], regex_pattern=r'[^-a-z0-9_]+')
-        )
-        name = name[:62]+'..' if len(name) > 64 else name
-        archive_path = '{}/{}'.format(
-            self._agave['parsed_archive_uri']['chopped_path'],
-            name
+        name = job_name(
+            map_item['attempt'], self._slug_step_name, template['output']
         )
+        archive_path = '{}/{}'.format(self._archive_chopped_path, name)
         app_template = {
             'name': name,
             'appId': self._app['implementation']['agave']['agave_app_id'],
             'archive': True,
             'inputs': inputs,
             'parameters': parameters,
-            'archiveSystem': self._agave['parsed_archive_uri']['authority'],
+            'archiveSystem': self._archive_authority,
             'archivePath': archive_path
         }
         # specify processors if 'slots' param given
-        if 'slots' in self._step['execution']['parameters']:
-            app_template['processorsPerNode'] = int(
-                self._step['execution']['parameters']['slots']
-            )
+        if 'slots' in exec_params:
+            app_template['processorsPerNode'] = int(exec_params['slots'])
         # specify memory if 'mem' param given
-        if 'mem' in self._step['execution']['parameters']:
-            app_template['memoryPerNode'] = '{}'.format(
-                self._step['execution']['parameters']['mem']
-            )
+        if 'mem' in exec_params:
+            app_template['memoryPerNode'] = '{}'.format(exec_params['mem'])
 
         Log.some().debug(
                 "[step.%s]: agave app template:\n%s",
                 self._step['name'],
-                pprint.pformat(app_template)
+                LazyFormat(app_template)
         )
 
+        return app_template
+
+
+    def _submit_job(self, app_template):
+        """
+        Clear the archive path of an agave job and submit the job.
+
+        Doesn't modify the step, so it can be called from multiple threads.
+
+        Args:
+            self: class instance.
+            app_template: agave job template dict.
+
+        Returns:
+            On success: agave job dict.
+            On failure: False.
+
+        """
+        name = app_template['name']
+
         # delete archive path if it exists
-        if DataManager.exists(
-                uri=self._agave['parsed_archive_uri']['chopped_uri']+'/'+name,
+        if not DataManager.delete_if_exists(
+                uri=self._archive_chopped_uri+'/'+name,
                 agave=self._agave
         ):
-            if not DataManager.delete(
-                    uri=self._agave['parsed_archive_uri']['chopped_uri']+'/'+name,
-                    agave=self._agave
-            ):
-                Log.a().warning(
-                    'cannot delete archive uri: %s/%s',
-                    self._agave['parsed_archive_uri']['chopped_uri'],
-                    name
-                )
+            Log.a().warning(
+                'cannot delete archive uri: %s/%s',
+                self._archive_chopped_uri,
+                name
+            )
 
         # submit job
-        job = self._agave['agave_wrapper'].jobs_submit(app_template)
+        return self._agave['agave_wrapper'].jobs_submit(app_template)
+
+
+    def _record_job(self, map_item, app_template, job):
+        """
+        Record the submitted agave job of a map item.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map).
+            app_template: agave job template dict.
+            job: submitted agave job dict, False if the submit failed.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
         if not job:
             msg = 'agave jobs submit failed for "{}"'.format(
                 app_template['name']
@@ -380,17 +480,16 @@ class AgaveStep(WorkflowStep):
         )
 
         # record job info
-        map_item['run'][map_item['attempt']]['agave_job_id'] = job['id']
-        map_item['run'][map_item['attempt']]['archive_uri'] = '{}/{}'\
-            .format(
-                self._agave['parsed_archive_uri']['chopped_uri'],
-                name
-            )
-        map_item['run'][map_item['attempt']]['hpc_job_id'] = ''
+        run = map_item['run'][map_item['attempt']]
+        run['agave_job_id'] = job['id']
+        run['archive_uri'] = '{}/{}'.format(
+            self._archive_chopped_uri, app_template['name']
+        )
+        run['hpc_job_id'] = ''
 
         # set status of process
         map_item['status'] = 'QUEUED'
-        map_item['run'][map_item['attempt']]['status'] = 'QUEUED'
+        run['status'] = 'QUEUED'
 
         return True
 
@@ -414,9 +513,28 @@ class AgaveStep(WorkflowStep):
             # exit without running anything new
             return True
 
-        for map_item in self._map:
-            if map_item['status'] == 'PENDING':
-                if not self._run_map(map_item):
+        # run pending map items, up to the throttle limit
+        pending_items = [
+            map_item for map_item in self._map
+            if map_item['status'] == 'PENDING'
+        ]
+        if self._throttle_limit > 0:
+            pending_items \
+                = pending_items[:self._throttle_limit-self._num_running]
+
+        if pending_items:
+            app_templates = [
+                self._get_app_template(map_item) for map_item in pending_items
+            ]
+
+            jobs = self._map_concurrent(
+                self._submit_job, app_templates, MAX_AGAVE_THREADS
+            )
+
+            for map_item, app_template, job in zip(
+                    pending_items, app_templates, jobs
+            ):
+                if not self._record_job(map_item, app_template, job):
                     msg = 'cannot run agave job for map item "{}"'\
                         .format(map_item['filename'])
                     Log.an().error(msg)
@@ -426,18 +544,50 @@ class AgaveStep(WorkflowStep):
 
                 else:
                     self._num_running += 1
-                    if (
-                        self._throttle_limit > 0
-                        and self._num_running >= self._throttle_limit
-                    ):
-                        # reached throttle limit
-                        break
 
         self._update_status_db('RUNNING', '')
 
         return True
 
 
+    def _get_job_statuses(self, job_ids):
+        """
+        Get the status of agave jobs.
+
+        Statuses are queried with a single job list call. Jobs missing from
+        the list, or all jobs if the list call fails, are queried one by one.
+
+        Args:
+            self: class instance.
+            job_ids: list of agave job IDs.
+
+        Returns:
+            List of job statuses, in the same order as job_ids. Failed status
+            queries are False.
+
+        """
+        if not job_ids:
+            return []
+
+        job_statuses = self._agave['agave_wrapper'].jobs_list_status(job_ids)
+        if not job_statuses:
+            job_statuses = {}
+
+        missing_job_ids = [
+            job_id for job_id in job_ids if job_id not in job_statuses
+        ]
+        job_statuses.update(zip(
+            missing_job_ids,
+            self._map_concurrent(
+                self._agave['agave_wrapper'].jobs_get_status,
+                missing_job_ids,
+                MAX_AGAVE_THREADS
+            )
+        ))
+
+        return [job_statuses[job_id] for job_id in job_ids]
+
+
     def _serialize_detail(self):
         """
         Serialize map-reduce items. No changes needed for Agave steps.
@@ -466,83 +616,102 @@ class AgaveStep(WorkflowStep):
 
         """
         # check if jobs are still running
-        for map_item in self._map:
-            if map_item['status'] not in ['FINISHED','FAILED','PENDING']:
-
-                map_item['status'] = self._agave['agave_wrapper'].jobs_get_status(
-                    map_item['run'][map_item['attempt']]['agave_job_id']
+        running_items = [
+            map_item for map_item in self._map
+            if map_item['status'] not in ['FINISHED','FAILED','PENDING']
+        ]
+        statuses = self._get_job_statuses([
+            map_item['run'][map_item['attempt']]['agave_job_id']
+            for map_item in running_items
+        ])
+        for map_item, status in zip(running_items, statuses):
+            map_item['status'] = status
+
+            # for status failures, set to 'UNKNOWN'
+            if not map_item['status']:
+                msg = 'cannot get job status for step "{}"'\
+                    .format(self._step['name'])
+                Log.a().warning(msg)
+                map_item['status'] = 'UNKNOWN'
+
+            if map_item['status'] in ['FINISHED','FAILED']:
+                # status changed to finished or failed
+                Log.a().debug(
+                    '[step.%s]: exit status: %s -> %s',
+                    self._step['name'],
+                    map_item['template']['output'],
+                    map_item['status']
                 )
 
-                # for status failures, set to 'UNKNOWN'
-                if not map_item['status']:
-                    msg = 'cannot get job status for step "{}"'\
-                        .format(self._step['name'])
-                    Log.a().warning(msg)
-                    map_item['status'] = 'UNKNOWN'
-
-                if map_item['status'] in ['FINISHED','FAILED']:
-                    # status changed to finished or failed
-                    Log.a().debug(
-                        '[step.%s]: exit status: %s -> %s',
-                        self._step['name'],
-                        map_item['template']['output'],
-                        map_item['status']
-                    )
-
-                    # decrease num running procs
-                    if self._num_running > 0:
-                        self._num_running -= 1
-
-            # check hpc job ids
-            if (
-                map_item['status'] != 'PENDING' \
-                and not map_item['run'][map_item['attempt']].get('hpc_job_id', '')
-            ):
-
-                # job id listed in history
-                response = self._agave['agave_wrapper'].jobs_get_history(
-                    map_item['run'][map_item['attempt']]['agave_job_id']
+                # decrease num running procs
+                if self._num_running > 0:
+                    self._num_running -= 1
+
+        # check hpc job ids, only for items polled above. items that were
+        # already finished or failed before this poll won't get a new one.
+        history_items = [
+            map_item for map_item in running_items
+            if not map_item['run'][map_item['attempt']].get('hpc_job_id', '')
+        ]
+        responses = self._map_concurrent(
+            self._agave['agave_wrapper'].jobs_get_history,
+            [
+                map_item['run'][map_item['attempt']]['agave_job_id']
+                for map_item in history_items
+            ],
+            MAX_AGAVE_THREADS
+        )
+        for map_item, response in zip(history_items, responses):
+            run = map_item['run'][map_item['attempt']]
+            # job id listed in history
+            if not response:
+                msg = 'cannot get hpc job id for job: agave_job_id={}'.format(
+                    run['agave_job_id']
                 )
+                Log.a().warning(msg)
 
-                if not response:
-                    msg = 'cannot get hpc job id for job: agave_job_id={}'.format(
-                        map_item['run'][map_item['attempt']]['agave_job_id']
-                    )
-                    Log.a().warning(msg)
-
-                else:
-                    for item in response:
-                        if item['status'] == 'QUEUED':
-                            match = re.match(
-                                r'^HPC.*local job (\d*)$', item['description']
+            else:
+                for item in response:
+                    if item['status'] == 'QUEUED':
+                        match = HPC_JOB_ID_REGEX.match(item['description'])
+                        if match:
+                            run['hpc_job_id'] = match.group(1)
+
+                            # log hpc job id
+                            Log.some().debug(
+                                '[step.%s]: hpc job id: %s -> %s',
+                                self._step['name'],
+                                map_item['template']['output'],
+                                match.group(1)
                             )
-                            if match:
-                                map_item['run'][map_item['attempt']]['hpc_job_id'] \
-                                    = match.group(1)
 
-                                # log hpc job id
-                                Log.some().debug(
-                                    '[step.%s]: hpc job id: %s -> %s',
-                                    self._step['name'],
-                                    map_item['template']['output'],
-                                    match.group(1)
-                                )
-
-                                break
+                            break
 
+        retry_items = []
+        for map_item in self._map:
             map_item['run'][map_item['attempt']]['status'] = map_item['status']
 
             if map_item['status'] == 'FAILED' and map_item['attempt'] < 5:
-                if self._throttle_limit == 0 or self._num_running < self._throttle_limit:
+                if (
+                        self._throttle_limit == 0
+                        or self._num_running + len(retry_items)
+                        < self._throttle_limit
+                ):
                     # retry job if not at retry or throttle limit
-                    if not self.retry_failed(map_item):
-                        Log.a().warning(
-                            '[step.%s]: cannot retry failed agave job (%s)',
-                            self._step['name'],
-                            map_item['template']['output']
-                        )
-                    else:
-                        self._num_running += 1
+                    retry_items.append(map_item)
+
+        # resubmit failed jobs after polling, all at once
+        for map_item, retried in zip(
+                retry_items, self._retry_failed_items(retry_items)
+        ):
+            if not retried:
+                Log.a().warning(
+                    '[step.%s]: cannot retry failed agave job (%s)',
+                    self._step['name'],
+                    map_item['template']['output']
+                )
+            else:
+                self._num_running += 1
 
         self._update_status_db(self._status, '')
 
@@ -561,27 +730,59 @@ class AgaveStep(WorkflowStep):
             False if failed/stopped job not restarted due to error
 
         """
-        # retry job
-        Log.some().info(
-            '[step.%s]: retrying agave job (%s), attempt number %s',
-            self._step['name'],
-            map_item['template']['output'],
-            map_item['attempt']+1
-        )
+        return self._retry_failed_items([map_item])[0]
 
-        # add another run to list
-        map_item['attempt'] += 1
-        map_item['run'].append({})
-        if not self._run_map(map_item):
-            Log.a().warning(
-                '[step.%s]: cannot retry agave job (%s), attempt number %s',
+
+    def _retry_failed_items(self, map_items):
+        """
+        Retry the jobs of multiple map items.
+
+        The jobs are submitted concurrently.
+
+        Args:
+            self: class instance.
+            map_items: list of map item objects (items of self._map).
+
+        Returns:
+            List of booleans, in the same order as map_items, True if the
+            job of the map item restarted successfully.
+
+        """
+        for map_item in map_items:
+            # retry job
+            Log.some().info(
+                '[step.%s]: retrying agave job (%s), attempt number %s',
                 self._step['name'],
                 map_item['template']['output'],
-                map_item['attempt']
+                map_item['attempt']+1
             )
-            return False
 
-        return True
+            # add another run to list
+            map_item['attempt'] += 1
+            map_item['run'].append({})
+
+        app_templates = [
+            self._get_app_template(map_item) for map_item in map_items
+        ]
+        jobs = self._map_concurrent(
+            self._submit_job, app_templates, MAX_AGAVE_THREADS
+        )
+
+        results = []
+        for map_item, app_template, job in zip(map_items, app_templates, jobs):
+            if not self._record_job(map_item, app_template, job):
+                Log.a().warning(
+                    '[step.%s]: cannot retry agave job (%s), attempt number %s',
+                    self._step['name'],
+                    map_item['template']['output'],
+                    map_item['attempt']
+                )
+                results.append(False)
+
+            else:
+                results.append(True)
+
+        return results
 
 
     def clean_up(self):
@@ -596,122 +797,144 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
-        # destination _log directory, common for all map items
-        dest_log_dir = '{}/{}'.format(
-            self._parsed_data_uris[self._source_context][0]\
-                ['chopped_uri'],
-            '_log'
+        # destination _log directory URI and path, common for all map items
+        parsed_data_uri = self._parsed_data_uris[self._source_context][0]
+        dest_log_dir = '{}/_log'.format(parsed_data_uri['chopped_uri'])
+        dest_log_path = '{}/_log'.format(parsed_data_uri['chopped_path'])
+
+        # list the archive of each map item concurrently to get all imports
+        map_imports = self._map_concurrent(
+            lambda map_item: self._get_clean_up_imports(
+                map_item, dest_log_path
+            ),
+            self._map,
+            MAX_AGAVE_THREADS
         )
+        if any(item_imports is False for item_imports in map_imports):
+            msg = 'cannot list agave archive for step "{}"'\
+                .format(self._step['name'])
+            Log.an().error(msg)
+            return self._fatal(msg)
 
-        # copy data for each map item
-        for map_item in self._map:
-
-            # copy step output
-            if not self._agave['agave_wrapper'].files_import_from_agave(
-                    self._parsed_data_uris[self._source_context][0]['authority'],
-                    self._parsed_data_uris[self._source_context][0]\
-                        ['chopped_path'],
-                    map_item['template']['output'],
-                    '{}/{}'.format(
-                        map_item['run'][map_item['attempt']]['archive_uri'],
-                        map_item['template']['output']
-                    )
-            ):
-                msg = 'agave import failed for step "{}"'\
-                    .format(self._step['name'])
-                Log.an().error(msg)
-                return self._fatal(msg)
-
-            # check for any agave log files (*.out and *.err files)
-            agave_log_list = DataManager.list(
-                uri=map_item['run'][map_item['attempt']]['archive_uri'],
-                agave=self._agave
-            )
-            if agave_log_list is False:
-                msg = 'cannot get agave log list for step "{}"'\
-                    .format(self._step['name'])
-                Log.an().error(msg)
-                return self._fatal(msg)
-
-            # copy each agave log file, the pattern is gf-{}-{}-{}.out or .err
-            for item in agave_log_list:
-                if re.match('^gf-\d*-.*\.(out|err)$', item):
-                    if not self._agave['agave_wrapper'].files_import_from_agave(
-                        self._parsed_data_uris[self._source_context][0]\
-                            ['authority'],
-                        '{}/{}'.format(
-                            self._parsed_data_uris[self._source_context][0]\
-                                ['chopped_path'],
-                            '_log'
-                        ),
-                        item,
-                        '{}/{}'.format(
-                            map_item['run'][map_item['attempt']]\
-                                ['archive_uri'],
-                            item
-                        )
-                    ):
-                        msg = 'cannot copy agave log item "{}"'.format(item)
-                        Log.an().error(msg)
-                        return self._fatal(msg)
-
-            # check if anything is in the _log directory
-            src_log_dir = '{}/{}'.format(
-                map_item['run'][map_item['attempt']]['archive_uri'],
-                '_log'
-            )
-
-            if DataManager.exists(
-                uri=src_log_dir,
+        imports = [
+            file_import
+            for item_imports in map_imports
+            for file_import in item_imports
+        ]
+
+        # create dest _log dir if it doesn't exist and any _log items are
+        # imported to it
+        if any(file_import[1] == dest_log_path for file_import in imports):
+            if not DataManager.exists(
+                uri=dest_log_dir,
                 agave=self._agave
             ):
-                # create dest _log dir if it doesn't exist
-                if not DataManager.exists(
+                if not DataManager.mkdir(
                     uri=dest_log_dir,
                     agave=self._agave
                 ):
-                    if not DataManager.mkdir(
-                        uri=dest_log_dir,
-                        agave=self._agave
-                    ):
-                        msg = 'cannot create _log directory for step "{}"'\
-                            .format(self._step['name'])
-                        Log.an().error(msg)
-                        return self._fatal(msg)
-
-                # get list of all items in src_log_dir
-                log_list = DataManager.list(
-                    uri=src_log_dir,
-                    agave=self._agave
-                )
-                if log_list is False:
-                    msg = 'cannot get _log list for step "{}"'\
+                    msg = 'cannot create _log directory for step "{}"'\
                         .format(self._step['name'])
                     Log.an().error(msg)
                     return self._fatal(msg)
 
-                # copy each list item
-                for item in log_list:
-                    if not self._agave['agave_wrapper'].files_import_from_agave(
-                        self._parsed_data_uris[self._source_context][0]\
-                            ['authority'],
-                        '{}/{}'.format(
-                            self._parsed_data_uris[self._source_context][0]\
-                                ['chopped_path'],
-                            '_log'
-                        ),
-                        item,
-                        '{}/{}/{}'.format(
-                            map_item['run'][map_item['attempt']]\
-                                ['archive_uri'],
-                            '_log',
-                            item
-                        )
-                    ):
-                        msg = 'cannot copy log item "{}"'.format(item)
-                        Log.an().error(msg)
-                        return self._fatal(msg)
+        # import all data concurrently
+        agave_wrapper = self._agave['agave_wrapper']
+        results = self._map_concurrent(
+            lambda file_import: agave_wrapper.files_import_from_agave(
+                *file_import
+            ),
+            imports,
+            MAX_AGAVE_THREADS
+        )
+        for file_import, result in zip(imports, results):
+            if not result:
+                msg = 'agave import failed for step "{}": {}'\
+                    .format(self._step['name'], file_import[3])
+                Log.an().error(msg)
+                return self._fatal(msg)
 
         self._update_status_db('FINISHED', '')
 
         return True
+
+
+    def _get_clean_up_imports(self, map_item, dest_log_path):
+        """
+        Get the data to import from the Agave archive location of a map item
+        to the step output location (data URI).
+
+        This includes the step output, agave log files, and items in the
+        _log directory of the archive.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map).
+            dest_log_path: destination _log directory path.
+
+        Returns:
+            On success: list of (system, dest path, dest name, src uri)
+                tuples, which are arguments of files_import_from_agave.
+            On failure: False.
+
+        """
+        # local aliases for lookups repeated below
+        parsed_data_uri = self._parsed_data_uris[self._source_context][0]
+        archive_uri = map_item['run'][map_item['attempt']]['archive_uri']
+        output = map_item['template']['output']
+
+        # step output
+        imports = [(
+            parsed_data_uri['authority'],
+            parsed_data_uri['chopped_path'],
+            output,
+            '{}/{}'.format(archive_uri, output)
+        )]
+
+        # check for any agave log files (*.out and *.err files)
+        agave_log_list = DataManager.list(
+            uri=archive_uri,
+            agave=self._agave
+        )
+        if agave_log_list is False:
+            Log.an().error(
+                'cannot get agave log list for step "%s"', self._step['name']
+            )
+            return False
+
+        # agave log files, the pattern is gf-{}-{}-{}.out or .err
+        imports.extend([
+            (
+                parsed_data_uri['authority'],
+                dest_log_path,
+                item,
+                '{}/{}'.format(archive_uri, item)
+            ) for item in agave_log_list if AGAVE_LOG_REGEX.match(item)
+        ])
+
+        # check if anything is in the _log directory, the archive list
+        # already shows whether it exists
+        if '_log' in agave_log_list:
+            src_log_dir = '{}/_log'.format(archive_uri)
+
+            # get list of all items in src_log_dir
+            log_list = DataManager.list(
+                uri=src_log_dir,
+                agave=self._agave
+            )
+            if log_list is False:
+                Log.an().error(
+                    'cannot get _log list for step "%s"', self._step['name']
+                )
+                return False
+
+            imports.extend([
+                (
+                    parsed_data_uri['authority'],
+                    dest_log_path,
+                    item,
+                    '{}/{}'.format(src_log_dir, item)
+                ) for item in log_list
+            ])
+
+        return imports
@@ -2,6 +2,7 @@
 
 import itertools
 import os
+import threading
 import time
 import urllib.parse
 
@@ -80,6 +81,9 @@ class AgaveWrapper:
                         and num_token_tries < that._config['token_retry']
                 ):
                     try:
+                        # token generation before the call, to tell if
+                        # another thread refreshed the token in the meantime
+                        token_generation = that._token_generation
                         try:
                             result = func(that, *args, **kwargs)
                             return result
@@ -97,49 +101,61 @@ class AgaveWrapper:
                                 # because token was refreshed in a different
                                 # thread/process
 
-                                # create new token
-                                if that._config['connection_type']\
-                                        == 'impersonate':
-                                    token_username='{}{}{}'.format(
-                                        that._config['domain'],
-                                        '/' if that._config['domain'] else '',
-                                        that._config['token_username']
-                                    )
-                                    Log.some().debug('user impersonation: %s', token_username)
-
-                                    # re-init object without losing object
-                                    # binding
-                                    that._agave.__init__(
-                                        api_server=that._config['server'],
-                                        username=that._config['username'],
-                                        password=that._config['password'],
-                                        token_username=token_username,
-                                        client_name=that._config['client'],
-                                        api_key=that._config['key'],
-                                        api_secret=that._config['secret'],
-                                        verify=False
-                                    )
-
-                                elif that._config['connection_type']\
-                                        == 'agave-cli':
-                                    # get updated credentials from
-                                    # ~/.agave/current
-                                    agave_clients = Agave._read_clients()
-                                    # don't verify ssl
-                                    agave_clients[0]['verify'] = False
-                                    # re-init object without losing object
-                                    # binding
-                                    that._agave.__init__(**agave_clients[0])
-
-                                else:
-                                    # shouldn't reach this condition, but raise
-                                    # exception just in case
-                                    raise Exception(
-                                        'invalid agave connection type: {}'\
-                                            .format(
-                                                that._config['connection_type']
-                                            )
-                                    )
+                                # create new token, one thread at a time
+                                # since the agave object is shared
+                                with that._token_lock:
+                                    if that._token_generation\
+                                            != token_generation:
+                                        # already refreshed by another
+                                        # thread, retry with the new token
+                                        Log.a().debug(
+                                            'agave token already refreshed'
+                                        )
+
+                                    elif that._config['connection_type']\
+                                            == 'impersonate':
+                                        token_username='{}{}{}'.format(
+                                            that._config['domain'],
+                                            '/' if that._config['domain'] else '',
+                                            that._config['token_username']
+                                        )
+                                        Log.some().debug('user impersonation: %s', token_username)
+
+                                        # re-init object without losing object
+                                        # binding
+                                        that._agave.__init__(
+                                            api_server=that._config['server'],
+                                            username=that._config['username'],
+                                            password=that._config['password'],
+                                            token_username=token_username,
+                                            client_name=that._config['client'],
+                                            api_key=that._config['key'],
+                                            api_secret=that._config['secret'],
+                                            verify=False
+                                        )
+                                        that._token_generation += 1
+
+                                    elif that._config['connection_type']\
+                                            == 'agave-cli':
+                                        # get updated credentials from
+                                        # ~/.agave/current
+                                        agave_clients = Agave._read_clients()
+                                        # don't verify ssl
+                                        agave_clients[0]['verify'] = False
+                                        # re-init object without losing object
+                                        # binding
+                                        that._agave.__init__(**agave_clients[0])
+                                        that._token_generation += 1
+
+                                    else:
+                                        # shouldn't reach this condition, but raise
+                                        # exception just in case
+                                        raise Exception(
+                                            'invalid agave connection type: {}'\
+                                                .format(
+                                                    that._config['connection_type']
+                                                )
+                                        )
 
                             if '404' in str(err):
                                 if not self._silent_404:
@@ -181,6 +197,12 @@ class AgaveWrapper:
         self._config = config
         self._agave = agave
 
+        # serializes token refreshes of threads sharing this wrapper, the
+        # generation counts refreshes so threads that got the same expired
+        # token only refresh it once
+        self._token_lock = threading.Lock()
+        self._token_generation = 0
+
         if token_username:
             self._config['token_username'] = token_username
 
@@ -423,6 +445,37 @@ class AgaveWrapper:
         return True
 
 
+    @AgaveRetry('files_delete')
+    def files_delete_if_exists(self, system_id, file_path):
+        """
+        Wrap AgavePy file delete command, ignoring missing files.
+
+        Args:
+            self: class instance.
+            system_id: Identifier for Agave storage system.
+            file_path: Path for file to be deleted.
+
+        Returns:
+            On success: True with no exceptions, also if the file doesn't
+                exist.
+            On failure: Throws exception.
+
+        """
+        try:
+            self._agave.files.delete(
+                systemId=system_id,
+                filePath=file_path
+            )
+
+        except Exception as err:
+            # nothing to delete
+            if str(err).startswith('404'):
+                return True
+            raise err
+
+        return True
+
+
     @AgaveRetry('files_mkdir')
     def files_mkdir(self, system_id, file_path, dir_name):
         """
@@ -631,6 +684,28 @@ class AgaveWrapper:
         return status
 
 
+    @AgaveRetry('jobs_list_status')
+    def jobs_list_status(self, job_ids):
+        """
+        Wrap AgavePy job list command to get the status of multiple jobs.
+
+        Args:
+            self: class instance.
+            job_ids: list of job identifiers.
+
+        Returns:
+            On success: dict mapping job identifiers to job status.
+            On failure: Throws exception.
+
+        """
+        response = self._agave.jobs.list(
+            search={'id.in': ','.join(job_ids)},
+            limit=len(job_ids)
+        )
+
+        return {job['id']: job['status'] for job in response}
+
+
     @AgaveRetry('jobs_get_history')
     def jobs_get_history(self, job_id):
         """
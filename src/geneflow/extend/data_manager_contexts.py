@@ -128,6 +128,25 @@ def _delete_local(uri, local=None):
     return True
 
 
+def _delete_if_exists_local(uri, local=None):
+    """
+    Delete local file/folder specified by URI if it exists.
+
+    Args:
+        uri: parsed URI to delete.
+        local: local context options.
+
+    Returns:
+        On success: True.
+        On failure: False.
+
+    """
+    if not os.path.exists(uri['chopped_path']):
+        return True
+
+    return _delete_local(uri, local)
+
+
 def _copy_local_local(src_uri, dest_uri, local=None):
     """
     Copy local data with system shell.
@@ -331,6 +350,29 @@ def _delete_agave(uri, agave):
     return True
 
 
+def _delete_if_exists_agave(uri, agave):
+    """
+    Delete agave file/folder specified by URI if it exists.
+
+    Args:
+        uri: parsed URI to delete.
+        agave: dict that contains:
+            agave_wrapper: Agave wrapper object.
+
+    Returns:
+        On success: True.
+        On failure: False.
+
+    """
+    if not agave['agave_wrapper'].files_delete_if_exists(
+            uri['authority'], uri['chopped_path']
+    ):
+        Log.an().error('cannot delete uri: %s', uri['chopped_path'])
+        return False
+
+    return True
+
+
 def _copy_agave_agave(src_uri, dest_uri, agave):
     """
     Copy Agave data using AgavePy Wrapper.
@@ -1,11 +1,15 @@
 """This module contains the GeneFlow GridengineStep class."""
 
-
 import drmaa
+import logging
 import os
+import queue
 from slugify import slugify
 import shutil
+import subprocess
+import time
 from wcmatch import glob
+import xml.etree.ElementTree as ET
 
 from geneflow.log import Log
 from geneflow.workflow_step import WorkflowStep
@@ -13,6 +17,26 @@ from geneflow.data_manager import DataManager
 from geneflow.uri_parser import URIParser
 
 
+# default max seconds between job status polls of a step
+MAX_POLL_DELAY = 30
+
+# glob flags for filtering map uri items
+MAP_GLOB_FLAGS = glob.EXTGLOB|glob.GLOBSTAR
+
+# characters not allowed in job names
+JOB_NAME_SLUG_PATTERN = r'[^-a-z0-9_]+'
+
+# max seconds to pause drmaa calls after communication errors
+MAX_DRMAA_BACKOFF = 60
+
+# max seconds to wait for qstat output
+QSTAT_TIMEOUT = 60
+
+# max number of threads for concurrent drmaa calls of a step, kept small
+# to limit load on the grid engine master
+MAX_DRMAA_THREADS = 4
+
+
 class GridengineStep(WorkflowStep):
     """
     A class that represents GridEngine Workflow Step objects.
@@ -55,6 +79,11 @@ class GridengineStep(WorkflowStep):
         # gridengine context data
         self._gridengine = gridengine
 
+        # step name slug, used in all job names of the step
+        self._slug_step_name = slugify(
+            self._step['name'], regex_pattern=JOB_NAME_SLUG_PATTERN
+        )
+
         self._job_status_map = {
             drmaa.JobState.UNDETERMINED: 'UNKNOWN',
             drmaa.JobState.QUEUED_ACTIVE: 'QUEUED',
@@ -68,6 +97,35 @@ class GridengineStep(WorkflowStep):
             drmaa.JobState.FAILED: 'FAILED'
         }
 
+        # seconds to wait between job status polls, doubled after each poll
+        # without status changes, reset when a status changes
+        self._poll_delay = 0
+        self._last_poll_time = None
+
+        # number of consecutive drmaa calls that failed to communicate with
+        # grid engine, and time until which drmaa calls are paused
+        self._drmaa_error_streak = 0
+        self._drmaa_backoff_until = 0
+
+        # full path of wrapper script, execution args of the wrapper script,
+        # and native specification of jobs, set by initialize()
+        self._wrapper_path = None
+        self._exec_args = []
+        self._native_spec = ''
+
+        # output path and _log path of the source data uri, set by
+        # initialize()
+        self._data_path = None
+        self._log_path = None
+
+        # non-empty default app inputs and parameters, set by initialize()
+        self._default_inputs = {}
+        self._default_params = {}
+
+        # drmaa job templates not in use, reused by job submissions, one
+        # per submitting thread at most
+        self._job_templates = queue.Queue()
+
 
     def initialize(self):
         """
@@ -108,6 +166,58 @@ class GridengineStep(WorkflowStep):
             Log.an().error(msg)
             return self._fatal(msg)
 
+        # get full path of wrapper script once for all jobs of the step
+        self._wrapper_path = shutil.which(
+            self._app['implementation']['local']['script']
+        )
+        if not self._wrapper_path:
+            msg = 'wrapper script not found in path: {}'.format(
+                self._app['implementation']['local']['script']
+            )
+            Log.an().error(msg)
+            return self._fatal(msg)
+
+        # source data uri paths used by every job of the step
+        self._data_path \
+            = self._parsed_data_uris[self._source_context][0]['chopped_path']
+        self._log_path = '{}/_log'.format(self._data_path)
+
+        # default app inputs and parameters, overwritten by template inputs
+        # and parameters of each map item
+        self._default_inputs = {
+            input_key: app_input['default']
+            for input_key, app_input in self._app['inputs'].items()
+            if app_input['default']
+        }
+        self._default_params = {
+            param_key: app_param['default']
+            for param_key, app_param in self._app['parameters'].items()
+            if app_param['default'] not in (None, '')
+        }
+
+        exec_params = self._step['execution']['parameters']
+
+        # add exeuction method
+        self._exec_args = [
+            '--exec_method={}'.format(self._step['execution']['method'])
+        ]
+
+        # specify execution init commands if 'init' param given
+        if 'init' in exec_params:
+            self._exec_args.append(
+                '--exec_init={}'.format(exec_params['init'])
+            )
+
+        # pass execution parameters to job template
+        native_spec = ''
+        if 'queue' in exec_params:
+            native_spec += ' -q {}'.format(exec_params['queue'])
+        if 'slots' in exec_params:
+            native_spec += ' -pe smp {}'.format(exec_params['slots'])
+        if 'other' in exec_params:
+            native_spec += ' {}'.format(exec_params['other'])
+        self._native_spec = native_spec
+
         return True
 
 
@@ -185,6 +295,7 @@ class GridengineStep(WorkflowStep):
             exception.
 
         """
+        map_glob = self._step['map']['glob']
         combined_file_list = []
         for uri in self._parsed_map_uris:
             # make sure map URI is compatible scheme (local)
@@ -198,7 +309,7 @@ class GridengineStep(WorkflowStep):
             # get file list from URI
             file_list = DataManager.list(
                 parsed_uri=uri,
-                globstr=self._step['map']['glob']
+                globstr=map_glob
             )
             if file_list is False:
                 msg = 'cannot get contents of map uri: {}'\
@@ -208,11 +319,7 @@ class GridengineStep(WorkflowStep):
 
             if self._step['map']['inclusive']:
                 # filter with glob
-                if glob.globfilter(
-                    [uri['name']],
-                    self._step['map']['glob'],
-                    flags=glob.EXTGLOB|glob.GLOBSTAR
-                ):
+                if glob.globfilter([uri['name']], map_glob, flags=MAP_GLOB_FLAGS):
                     combined_file_list.append({
                         'chopped_uri': '{}://{}{}'.format(
                             uri['scheme'],
@@ -222,17 +329,19 @@ class GridengineStep(WorkflowStep):
                         'filename': uri['name']
                     })
 
+            # prefix of recursive elements, relative folder is appended
+            recursive_prefix = '{}://{}{}'.format(
+                uri['scheme'],
+                uri['authority'],
+                uri['chopped_path'].rstrip('/')
+            )
             for f in file_list:
-                if '/' in f:
-                    # reparse uri to correctly represent recursive elements
-                    new_uri = URIParser.parse('{}/{}'.format(uri['chopped_uri'], f))
+                folder, _, filename = f.rpartition('/')
+                if folder:
+                    # split recursive elements into folder and file name
                     combined_file_list.append({
-                        'chopped_uri': '{}://{}{}'.format(
-                            new_uri['scheme'],
-                            new_uri['authority'],
-                            new_uri['folder']
-                        ),
-                        'filename': new_uri['name']
+                        'chopped_uri': '{}/{}'.format(recursive_prefix, folder),
+                        'filename': filename
                     })
                 else:
                     combined_file_list.append({
@@ -256,105 +365,77 @@ class GridengineStep(WorkflowStep):
             On failure: False.
 
         """
+        template = map_item['template']
+
         # load default app inputs, overwrite with template inputs
-        inputs = {}
-        for input_key in self._app['inputs']:
-            if input_key in map_item['template']:
-                inputs[input_key] = map_item['template'][input_key]
-            else:
-                if self._app['inputs'][input_key]['default']:
-                    inputs[input_key] = self._app['inputs'][input_key]['default']
+        inputs = {
+            input_key: (
+                template[input_key] if input_key in template
+                else self._default_inputs[input_key]
+            )
+            for input_key in self._app['inputs']
+            if input_key in template or input_key in self._default_inputs
+        }
 
         # load default app parameters, overwrite with template parameters
-        parameters = {}
-        for param_key in self._app['parameters']:
-            if param_key in map_item['template']:
-                parameters[param_key] = map_item['template'][param_key]
-            else:
-                if self._app['parameters'][param_key]['default'] not in [None, '']:
-                    parameters[param_key] \
-                        = self._app['parameters'][param_key]['default']
-
-        # get full path of wrapper script
-        path = shutil.which(self._app['implementation']['local']['script'])
-        if not path:
-            msg = 'wrapper script not found in path: %s'.format(
-                self._app['implementation']['local']['script']
+        parameters = {
+            param_key: (
+                template[param_key] if param_key in template
+                else self._default_params[param_key]
             )
-            Log.an().error(msg)
-            return self._fatal(msg)
+            for param_key in self._app['parameters']
+            if param_key in template or param_key in self._default_params
+        }
 
         # construct argument list for wrapper script
-        args = [path]
-        for input_key in inputs:
-            if inputs[input_key]:
-                args.append('--{}={}'.format(
-                    input_key,
-                    URIParser.parse(inputs[input_key])['chopped_path']
-                ))
-        for param_key in parameters:
-            if param_key == 'output':
-                args.append('--output={}/{}'.format(
-                    self._parsed_data_uris[self._source_context][0]\
-                        ['chopped_path'],
-                    parameters['output']
-                ))
-
-            else:
-                args.append('--{}={}'.format(
-                    param_key, parameters[param_key]
-                ))
-
-        # add exeuction method
-        args.append('--exec_method={}'.format(self._step['execution']['method']))
+        args = [self._wrapper_path]
+        args.extend(
+            '--{}={}'.format(
+                input_key, URIParser.parse(input_value)['chopped_path']
+            )
+            for input_key, input_value in inputs.items() if input_value
+        )
+        args.extend(
+            '--output={}/{}'.format(self._data_path, param_value)
+            if param_key == 'output'
+            else '--{}={}'.format(param_key, param_value)
+            for param_key, param_value in parameters.items()
+        )
 
-        # specify execution init commands if 'init' param given
-        if 'init' in self._step['execution']['parameters']:
-            args.append('--exec_init={}'.format(self._step['execution']['parameters']['init']))
+        # add execution method and init commands
+        args.extend(self._exec_args)
 
-        Log.a().debug(
-            '[step.%s]: command: %s -> %s',
-            self._step['name'],
-            map_item['template']['output'],
-            ' '.join(args)
-        )
+        # only join args if the command is logged
+        if Log.a().isEnabledFor(logging.DEBUG):
+            Log.a().debug(
+                '[step.%s]: command: %s -> %s',
+                self._step['name'],
+                map_item['template']['output'],
+                ' '.join(args)
+            )
 
         # construct job name
         name = 'gf-{}-{}-{}'.format(
             map_item['attempt'],
-            slugify(self._step['name'], regex_pattern=r'[^-a-z0-9_]+'),
-            slugify(map_item['template']['output'], regex_pattern=r'[^-a-z0-9_]+')
+            self._slug_step_name,
+            slugify(
+                map_item['template']['output'],
+                regex_pattern=JOB_NAME_SLUG_PATTERN
+            )
         )
 
         # construct paths for logging stdout and stderr
-        log_path = '{}/_log/{}'.format(
-            self._parsed_data_uris[self._source_context][0]['chopped_path'],
-            name
-        )
+        log_path = '{}/{}'.format(self._log_path, name)
 
-        # create and populate job template
-        jt = self._gridengine['drmaa_session'].createJobTemplate()
-        jt.remoteCommand = '/bin/bash'
+        # populate job template
+        jt = self._get_job_template()
         jt.args = args
         jt.jobName = name
-        jt.errorPath = ':{}.err'.format(log_path)
         jt.outputPath = ':{}.out'.format(log_path)
+        if not self._gridengine.get('join_files', False):
+            jt.errorPath = ':{}.err'.format(log_path)
 
-        # pass execution parameters to job template
-        native_spec = ''
-        if 'queue' in self._step['execution']['parameters']:
-            native_spec += ' -q {}'.format(
-                self._step['execution']['parameters']['queue']
-            )
-        if 'slots' in self._step['execution']['parameters']:
-            native_spec += ' -pe smp {}'.format(
-                self._step['execution']['parameters']['slots']
-            )
-        if 'other' in self._step['execution']['parameters']:
-            native_spec += ' {}'.format(
-                self._step['execution']['parameters']['other']
-            )
-        jt.nativeSpecification = native_spec
+        run = map_item['run'][map_item['attempt']]
 
         # submit hpc job using drmaa library
         try:
@@ -367,11 +448,13 @@ class GridengineStep(WorkflowStep):
 
             # set to failed, but return True so that it's retried
             map_item['status'] = 'FAILED'
-            map_item['run'][map_item['attempt']]['status'] = 'FAILED'
+            run['status'] = 'FAILED'
 
             return True
 
-        self._gridengine['drmaa_session'].deleteJobTemplate(jt)
+        finally:
+            # template can be reused once the job is submitted
+            self._job_templates.put(jt)
 
         Log.a().debug(
             '[step.%s]: hpc job id: %s -> %s',
@@ -381,15 +464,48 @@ class GridengineStep(WorkflowStep):
         )
 
         # record job info
-        map_item['run'][map_item['attempt']]['hpc_job_id'] = job_id
+        run['hpc_job_id'] = job_id
 
         # set status of process
         map_item['status'] = 'QUEUED'
-        map_item['run'][map_item['attempt']]['status'] = 'QUEUED'
+        run['status'] = 'QUEUED'
 
         return True
 
 
+    def _get_job_template(self):
+        """
+        Get a drmaa job template for a job submission.
+
+        Reuse a template of an earlier submission if one is available, or
+        create a new one. Only the job specific attributes of the template
+        must be set by the caller. The template must be returned to
+        self._job_templates after the job is submitted.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            drmaa job template.
+
+        """
+        try:
+            return self._job_templates.get_nowait()
+
+        except queue.Empty:
+            jt = self._gridengine['drmaa_session'].createJobTemplate()
+            jt.remoteCommand = '/bin/bash'
+
+            # pass execution parameters to job template
+            jt.nativeSpecification = self._native_spec
+
+            # write stderr to the stdout log file if configured
+            if self._gridengine.get('join_files', False):
+                jt.joinFiles = True
+
+            return jt
+
+
     def run(self):
         """
         Execute shell scripts for each of the map items, as long as
@@ -404,36 +520,125 @@ class GridengineStep(WorkflowStep):
             On success: True.
             On failure: False.
 
+        """
+        if not self._submit_pending():
+            return True
+
+        self._update_status_db('RUNNING', '')
+
+        return True
+
+
+    def _submit_pending(self):
+        """
+        Submit jobs of pending map items, up to the throttle limit.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            True if pending map items were checked, False if the throttle
+            limit is reached or grid engine calls are paused.
+
         """
         if self._throttle_limit > 0 and self._num_running >= self._throttle_limit:
             # throttle limit reached
             # exit without running anything new
-            return True
+            return False
 
-        for map_item in self._map:
-            if map_item['status'] == 'PENDING':
-                if not self._run_map(map_item):
-                    msg = 'cannot queue job for map item "{}"'\
-                        .format(map_item['filename'])
-                    Log.an().error(msg)
-                    map_item['status'] = 'FAILED'
-                    map_item['run'][map_item['attempt']]['status']\
-                        = map_item['status']
+        if self._drmaa_backoff():
+            # grid engine communication failed recently
+            # exit without running anything new
+            return False
 
-                else:
-                    self._num_running += 1
-                    if (
-                        self._throttle_limit > 0
-                        and self._num_running >= self._throttle_limit
-                    ):
-                        # reached throttle limit
-                        break
+        # run pending map items, up to the throttle limit
+        pending_items = [
+            map_item for map_item in self._map
+            if map_item['status'] == 'PENDING'
+        ]
+        if self._throttle_limit > 0:
+            pending_items \
+                = pending_items[:self._throttle_limit-self._num_running]
+
+        # submit jobs concurrently, each call only modifies its own map item
+        results = self._map_concurrent(
+            self._run_map, pending_items, MAX_DRMAA_THREADS
+        )
 
-        self._update_status_db('RUNNING', '')
+        # submits that failed to communicate set the item to failed, but
+        # still succeed so that the item is retried
+        self._update_drmaa_backoff(
+            sum(map_item['status'] == 'QUEUED' for map_item in pending_items),
+            sum(
+                result and map_item['status'] == 'FAILED'
+                for map_item, result in zip(pending_items, results)
+            )
+        )
+
+        for map_item, result in zip(pending_items, results):
+            if not result:
+                msg = 'cannot queue job for map item "{}"'\
+                    .format(map_item['filename'])
+                Log.an().error(msg)
+                map_item['status'] = 'FAILED'
+                map_item['run'][map_item['attempt']]['status']\
+                    = map_item['status']
+
+            else:
+                self._num_running += 1
+                # poll new jobs without back off
+                self._poll_delay = 0
 
         return True
 
 
+    def _drmaa_backoff(self):
+        """
+        Check if drmaa calls are paused after communication errors.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            True if drmaa calls are paused, False otherwise.
+
+        """
+        return time.monotonic() < self._drmaa_backoff_until
+
+
+    def _update_drmaa_backoff(self, num_ok, num_errors):
+        """
+        Update the drmaa communication error streak and pause.
+
+        Any successful call ends the streak. Otherwise, each batch of calls
+        with communication errors doubles the pause, up to
+        MAX_DRMAA_BACKOFF seconds, so that an unreachable grid engine master
+        isn't flooded with submits, status polls and retries.
+
+        Args:
+            self: class instance.
+            num_ok: number of successful drmaa calls.
+            num_errors: number of drmaa calls with communication errors.
+
+        Returns:
+            None.
+
+        """
+        if num_ok:
+            self._drmaa_error_streak = 0
+            self._drmaa_backoff_until = 0
+
+        elif num_errors:
+            self._drmaa_error_streak += 1
+            backoff = min(MAX_DRMAA_BACKOFF, 2**self._drmaa_error_streak)
+            self._drmaa_backoff_until = time.monotonic() + backoff
+            Log.a().warning(
+                '[step.%s]: pausing gridengine calls for %s seconds',
+                self._step['name'],
+                backoff
+            )
+
+
     def _serialize_detail(self):
         """
         Serialize map-reduce items.
@@ -450,6 +655,175 @@ class GridengineStep(WorkflowStep):
         return self._map
 
 
+    def _get_job_statuses(self, job_ids):
+        """
+        Get the status of multiple gridengine jobs.
+
+        DRMAA has no call that returns the state of multiple jobs, but a
+        single non-blocking synchronize() shows whether all of them have
+        ended. Only if some are still active is each job queried.
+
+        Args:
+            self: class instance.
+            job_ids: list of hpc job ids.
+
+        Returns:
+            Dict of job statuses, keyed by hpc job id. Status is 'UNKNOWN'
+            if the status of a job cannot be retrieved.
+
+        """
+        if not job_ids:
+            return {}
+
+        if self._gridengine.get('qstat_status', False):
+            statuses = self._get_qstat_job_statuses(job_ids)
+            if statuses:
+                return statuses
+
+        drmaa_session = self._gridengine['drmaa_session']
+
+        try:
+            # don't dispose of jobs, exit status is checked with "wait"
+            drmaa_session.synchronize(
+                job_ids, drmaa_session.TIMEOUT_NO_WAIT, False
+            )
+            # all jobs have ended, exit status tells if they failed
+            self._update_drmaa_backoff(len(job_ids), 0)
+            return {job_id: 'FINISHED' for job_id in job_ids}
+
+        except drmaa.errors.ExitTimeoutException:
+            # some jobs are still active
+            pass
+
+        except drmaa.errors.DrmaaException as err:
+            Log.a().debug(
+                '[step.%s]: cannot synchronize jobs [%s]',
+                self._step['name'],
+                str(err)
+            )
+
+        def get_job_status(job_id):
+            try:
+                # can only get job status if it has not already been disposed with "wait"
+                return self._job_status_map[drmaa_session.jobStatus(job_id)]
+
+            except drmaa.DrmCommunicationException as err:
+                msg = 'cannot get job status for step "{}" [{}]'\
+                        .format(self._step['name'], str(err))
+                Log.a().warning(msg)
+                return None
+
+        statuses = self._map_concurrent(
+            get_job_status, job_ids, MAX_DRMAA_THREADS
+        )
+        num_errors = statuses.count(None)
+        self._update_drmaa_backoff(len(job_ids)-num_errors, num_errors)
+
+        return {
+            job_id: status if status else 'UNKNOWN'
+            for job_id, status in zip(job_ids, statuses)
+        }
+
+
+    def _get_qstat_job_statuses(self, job_ids):
+        """
+        Get the status of multiple gridengine jobs with one qstat command.
+
+        qstat lists the jobs of the user that haven't ended yet, so jobs
+        missing from the list are finished. Their exit status is checked
+        with "wait". Jobs in error state stay queued until deleted, so they
+        are terminated and reported as failed.
+
+        Args:
+            self: class instance.
+            job_ids: list of hpc job ids.
+
+        Returns:
+            On success: dict of job statuses, keyed by hpc job id.
+            On failure: False.
+
+        """
+        try:
+            qstat = subprocess.run(
+                ['qstat', '-xml'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                timeout=QSTAT_TIMEOUT,
+                check=True
+            )
+            root = ET.fromstring(qstat.stdout)
+
+        except (
+                OSError, subprocess.SubprocessError, ET.ParseError
+        ) as err:
+            Log.a().warning(
+                '[step.%s]: cannot get job status with qstat [%s]',
+                self._step['name'],
+                str(err)
+            )
+            return False
+
+        # state codes, e.g., qw, hqw, Eqw, r, t, s, dr
+        qstat_states = {
+            job.findtext('JB_job_number'): job.findtext('state', '')
+            for job in root.iter('job_list')
+        }
+
+        statuses = {}
+        for job_id in job_ids:
+            state = qstat_states.get(job_id)
+            if state is None:
+                statuses[job_id] = 'FINISHED'
+            elif 'E' in state:
+                # error state, e.g., Eqw
+                statuses[job_id] = 'FAILED'
+                self._terminate_job(job_id)
+            elif 'q' in state or 'h' in state:
+                # queued or on hold
+                statuses[job_id] = 'QUEUED'
+            else:
+                # running, transferring, suspended, or being deleted
+                statuses[job_id] = 'RUNNING'
+
+        return statuses
+
+
+    def _terminate_job(self, job_id):
+        """
+        Terminate a gridengine job.
+
+        Args:
+            self: class instance.
+            job_id: hpc job id.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        Log.a().warning(
+            '[step.%s]: terminating gridengine job %s in error state',
+            self._step['name'],
+            job_id
+        )
+        drmaa_session = self._gridengine['drmaa_session']
+        try:
+            drmaa_session.control(job_id, drmaa.JobControlAction.TERMINATE)
+
+        except drmaa.errors.DrmaaException as err:
+            # job may already be deleted
+            Log.a().debug(
+                '[step.%s]: cannot terminate job %s [%s]',
+                self._step['name'],
+                job_id,
+                str(err)
+            )
+            return False
+
+        return True
+
+
     def check_running_jobs(self):
         """
         Check the status/progress of all map-reduce items and update _map status.
@@ -461,47 +835,118 @@ class GridengineStep(WorkflowStep):
             True.
 
         """
-        # check if jobs are running, finished, or failed
-        for map_item in self._map:
-            if map_item['status'] not in ['FINISHED','FAILED','PENDING']:
-                try:
-                    # can only get job status if it has not already been disposed with "wait"
-                    status = self._gridengine['drmaa_session'].jobStatus(
-                        map_item['run'][map_item['attempt']]['hpc_job_id']
-                    )
-                    map_item['status'] = self._job_status_map[status]
-
-                except drmaa.DrmCommunicationException as err:
-                    msg = 'cannot get job status for step "{}" [{}]'\
-                            .format(self._step['name'], str(err))
-                    Log.a().warning(msg)
-                    map_item['status'] = 'UNKNOWN'
-
-                if map_item['status'] in ['FINISHED','FAILED']:
-                    # check exit status
-                    job_info = self._gridengine['drmaa_session'].wait(
-                        map_item['run'][map_item['attempt']]['hpc_job_id'],
-                        self._gridengine['drmaa_session'].TIMEOUT_NO_WAIT
-                    )
-                    Log.a().debug(
-                        '[step.%s]: exit status: %s -> %s',
-                        self._step['name'],
-                        map_item['template']['output'],
-                        job_info.exitStatus
-                    )
-                    if job_info.exitStatus > 0:
-                        # job actually failed
-                        map_item['status'] = 'FAILED'
-
-                    # decrease num running procs
-                    if self._num_running > 0:
-                        self._num_running -= 1
+        # skip the poll if the last one was recent, statuses haven't changed
+        # in a while, or if grid engine communication failed recently
+        now = time.monotonic()
+        if (
+                self._last_poll_time is not None
+                and now - self._last_poll_time < self._poll_delay
+        ) or self._drmaa_backoff():
+            return True
+        self._last_poll_time = now
+
+        # check if jobs are running, finished, or failed, get the status of
+        # all running jobs before updating any map items
+        running_items = [
+            map_item for map_item in self._map
+            if map_item['status'] not in ['FINISHED','FAILED','PENDING']
+        ]
+        job_ids = [
+            map_item['run'][map_item['attempt']]['hpc_job_id']
+            for map_item in running_items
+        ]
+        statuses = self._get_job_statuses(job_ids)
+        prev_statuses = [map_item['status'] for map_item in running_items]
+        for map_item, job_id in zip(running_items, job_ids):
+            map_item['status'] = statuses[job_id]
+
+        # check exit status of all ended jobs in one pass
+        ended_items = [
+            map_item for map_item in running_items
+            if map_item['status'] in ['FINISHED','FAILED']
+        ]
+        drmaa_session = self._gridengine['drmaa_session']
+
+        def get_job_info(job_id):
+            try:
+                return drmaa_session.wait(
+                    job_id, drmaa_session.TIMEOUT_NO_WAIT
+                )
+
+            except drmaa.errors.ExitTimeoutException:
+                # job hasn't been reaped yet, e.g. missing from qstat
+                # before grid engine records its exit status
+                return None
 
+            except drmaa.errors.DrmaaException as err:
+                Log.a().warning(
+                    '[step.%s]: cannot get exit status of job %s [%s]',
+                    self._step['name'],
+                    job_id,
+                    str(err)
+                )
+                return False
+
+        job_infos = self._map_concurrent(
+            get_job_info,
+            [
+                map_item['run'][map_item['attempt']]['hpc_job_id']
+                for map_item in ended_items
+            ],
+            MAX_DRMAA_THREADS
+        )
+        waited_items = []
+        for map_item, job_info in zip(ended_items, job_infos):
+            if job_info is None:
+                # check the job again on the next poll
+                map_item['status'] = 'RUNNING'
+                continue
+
+            waited_items.append(map_item)
+            if job_info is False:
+                # exit status can't be retrieved, retry the job
+                map_item['status'] = 'FAILED'
+
+            else:
+                Log.a().debug(
+                    '[step.%s]: exit status: %s -> %s',
+                    self._step['name'],
+                    map_item['template']['output'],
+                    job_info.exitStatus
+                )
+                if job_info.wasAborted or job_info.exitStatus > 0:
+                    # job actually failed
+                    map_item['status'] = 'FAILED'
+
+            # decrease num running procs
+            if self._num_running > 0:
+                self._num_running -= 1
+        ended_items = waited_items
+
+        # back off while no job changes status, compared after the exit
+        # status check, since jobs that can't be waited on yet are reset
+        changed = any(
+            map_item['status'] != prev_status
+            for map_item, prev_status in zip(running_items, prev_statuses)
+        )
+        if changed:
+            self._poll_delay = 0
+        else:
+            self._poll_delay = min(
+                max(2*self._poll_delay, self._config.get('run_poll_delay', 2)),
+                self._config.get('run_poll_max_delay', MAX_POLL_DELAY)
+            )
+
+        for map_item in self._map:
             map_item['run'][map_item['attempt']]['status'] = map_item['status']
 
             if map_item['status'] == 'FAILED' and map_item['attempt'] < 5:
-                if self._throttle_limit == 0 or self._num_running < self._throttle_limit:
-                    # retry job if not at retry or throttle limit
+                if (
+                        self._throttle_limit == 0
+                        or self._num_running < self._throttle_limit
+                ) and not self._drmaa_backoff():
+                    # retry job if not at retry or throttle limit, and grid
+                    # engine communication hasn't failed recently
                     if not self.retry_failed(map_item):
                         Log.a().warning(
                             '[step.%s]: cannot retry failed gridengine job (%s)',
@@ -511,6 +956,11 @@ class GridengineStep(WorkflowStep):
                     else:
                         self._num_running += 1
 
+        # fill the slots of ended jobs now instead of after the next poll
+        # delay
+        if ended_items:
+            self._submit_pending()
+
         self._update_status_db(self._status, '')
 
         return True
@@ -548,4 +998,34 @@ class GridengineStep(WorkflowStep):
             )
             return False
 
+        # a failed submit leaves the job failed
+        if map_item['status'] == 'FAILED':
+            self._update_drmaa_backoff(0, 1)
+        else:
+            self._update_drmaa_backoff(1, 0)
+
         return True
+
+
+    def clean_up(self):
+        """
+        Delete the drmaa job templates of the step.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        while not self._job_templates.empty():
+            jt = self._job_templates.get_nowait()
+            try:
+                self._gridengine['drmaa_session'].deleteJobTemplate(jt)
+            except drmaa.errors.DrmaaException as err:
+                Log.a().warning(
+                    'cannot delete drmaa job template: [%s]', str(err)
+                )
+
+        return super(GridengineStep, self).clean_up()
@@ -88,11 +88,19 @@ class GridengineWorkflow:
             None.
 
         Returns:
-            Dict containing drmaa session.
+            Dict containing drmaa session, join_files and qstat_status options.
 
         """
         return {
-            'drmaa_session': self._drmaa_session
+            'drmaa_session': self._drmaa_session,
+            # merge stderr of jobs into the stdout log file
+            'join_files': self._config.get('gridengine', {}).get(
+                'join_files', False
+            ),
+            # poll job states with a single qstat command
+            'qstat_status': self._config.get('gridengine', {}).get(
+                'qstat_status', False
+            )
         }
 
 
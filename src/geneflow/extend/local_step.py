@@ -1,6 +1,7 @@
 """This module contains the GeneFlow LocalStep class."""
 
-
+from functools import lru_cache
+import os
 from slugify import slugify
 from wcmatch import glob
 
@@ -11,6 +12,25 @@ from geneflow.uri_parser import URIParser
 from geneflow.shell_wrapper import ShellWrapper
 
 
+# glob flags for filtering map uri items
+MAP_GLOB_FLAGS = glob.EXTGLOB|glob.GLOBSTAR
+
+# map globs that match any name that isn't hidden
+MATCH_ALL_GLOBS = ('*', '**')
+
+# characters not allowed in job names
+JOB_NAME_SLUG_PATTERN = r'[^-a-z0-9_]+'
+
+# max number of threads for concurrent process spawns of a step
+MAX_SPAWN_THREADS = 2*(os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=2048)
+def job_name_slug(value):
+    """Slugify part of a job name, cached since outputs often repeat."""
+    return slugify(value, regex_pattern=JOB_NAME_SLUG_PATTERN)
+
+
 class LocalStep(WorkflowStep):
     """
     A class that represents Local Workflow step objects.
@@ -50,6 +70,24 @@ class LocalStep(WorkflowStep):
             clean
         )
 
+        # step name slug, used in all log file names of the step
+        self._slug_step_name = job_name_slug(self._step['name'])
+
+        # output path of the source data uri, non-empty default app inputs
+        # and parameters, and execution args of the script, set by
+        # initialize()
+        self._data_path = None
+        self._default_inputs = {}
+        self._default_params = {}
+        self._exec_args = []
+
+        # serialized run histories of map items, by map index, and indexes
+        # of map items that changed since they were last serialized. file
+        # names of recursive map items aren't unique, so they can't be used
+        # as keys
+        self._detail_items = []
+        self._changed_items = set()
+
 
     def initialize(self):
         """
@@ -89,6 +127,34 @@ class LocalStep(WorkflowStep):
             Log.an().error(msg)
             return self._fatal(msg)
 
+        # source data uri path used by every job of the step
+        self._data_path \
+            = self._parsed_data_uris[self._source_context][0]['chopped_path']
+
+        # default app inputs and parameters, overwritten by template inputs
+        # and parameters of each map item
+        self._default_inputs = {
+            input_key: app_input['default']
+            for input_key, app_input in self._app['inputs'].items()
+            if app_input['default']
+        }
+        self._default_params = {
+            param_key: app_param['default']
+            for param_key, app_param in self._app['parameters'].items()
+            if app_param['default'] not in (None, '')
+        }
+
+        # add exeuction method
+        self._exec_args = [
+            '--exec_method={}'.format(self._step['execution']['method'])
+        ]
+
+        # specify execution init commands if 'init' param given
+        if 'init' in self._step['execution']['parameters']:
+            self._exec_args.append('--exec_init={}'.format(
+                self._step['execution']['parameters']['init']
+            ))
+
         return True
 
 
@@ -166,6 +232,8 @@ class LocalStep(WorkflowStep):
             exception.
 
         """
+        map_glob = self._step['map']['glob']
+        match_all = map_glob in MATCH_ALL_GLOBS
         combined_file_list = []
         for uri in self._parsed_map_uris:
             # make sure map URI is compatible scheme (local)
@@ -179,7 +247,7 @@ class LocalStep(WorkflowStep):
             # get file list from URI
             file_list = DataManager.list(
                 parsed_uri=uri,
-                globstr=self._step['map']['glob']
+                globstr=map_glob
             )
 
             if file_list is False:
@@ -190,10 +258,12 @@ class LocalStep(WorkflowStep):
 
             if self._step['map']['inclusive']:
                 # filter with glob
-                if glob.globfilter(
-                    [uri['name']],
-                    self._step['map']['glob'],
-                    flags=glob.EXTGLOB|glob.GLOBSTAR
+                if (
+                        match_all
+                        and uri['name']
+                        and not uri['name'].startswith('.')
+                ) or glob.globfilter(
+                    [uri['name']], map_glob, flags=MAP_GLOB_FLAGS
                 ):
                     combined_file_list.append({
                         'chopped_uri': '{}://{}{}'.format(
@@ -204,17 +274,19 @@ class LocalStep(WorkflowStep):
                         'filename': uri['name']
                     })
 
+            # prefix of recursive elements, relative folder is appended
+            recursive_prefix = '{}://{}{}'.format(
+                uri['scheme'],
+                uri['authority'],
+                uri['chopped_path'].rstrip('/')
+            )
             for f in file_list:
-                if '/' in f:
-                    # reparse uri to correctly represent recursive elements
-                    new_uri = URIParser.parse('{}/{}'.format(uri['chopped_uri'], f))
+                folder, _, filename = f.rpartition('/')
+                if folder:
+                    # split recursive elements into folder and file name
                     combined_file_list.append({
-                        'chopped_uri': '{}://{}{}'.format(
-                            new_uri['scheme'],
-                            new_uri['authority'],
-                            new_uri['folder']
-                        ),
-                        'filename': new_uri['name']
+                        'chopped_uri': '{}/{}'.format(recursive_prefix, folder),
+                        'filename': filename
                     })
                 else:
                     combined_file_list.append({
@@ -229,79 +301,88 @@ class LocalStep(WorkflowStep):
         """
         Run a job for each map item and store the proc and PID.
 
+        Only modifies the map item, so it can be called from multiple
+        threads. Errors are recorded by the caller.
+
         Args:
             self: class instance.
             map_item: map item object (item of self._map).
 
         Returns:
-            On success: True.
-            On failure: False.
+            On success: None.
+            On failure: error message.
 
         """
+        template = map_item['template']
+
         # load default app inputs, overwrite with template inputs
-        inputs = {}
-        for input_key in self._app['inputs']:
-            if input_key in map_item['template']:
-                inputs[input_key] = map_item['template'][input_key]
-            else:
-                if self._app['inputs'][input_key]['default']:
-                    inputs[input_key] = self._app['inputs'][input_key]['default']
+        inputs = {
+            input_key: (
+                template[input_key] if input_key in template
+                else self._default_inputs[input_key]
+            )
+            for input_key in self._app['inputs']
+            if input_key in template or input_key in self._default_inputs
+        }
 
         # load default app parameters, overwrite with template parameters
-        parameters = {}
-        for param_key in self._app['parameters']:
-            if param_key in map_item['template']:
-                parameters[param_key] = map_item['template'][param_key]
-            else:
-                if self._app['parameters'][param_key]['default'] not in [None, '']:
-                    parameters[param_key] \
-                        = self._app['parameters'][param_key]['default']
-
-        # construct shell command
-        cmd = self._app['implementation']['local']['script']
-        for input_key in inputs:
-            if inputs[input_key]:
-                cmd += ' --{}="{}"'.format(
-                    input_key,
-                    URIParser.parse(inputs[input_key])['chopped_path']
-                )
-        for param_key in parameters:
-            if param_key == 'output':
-                cmd += ' --output="{}/{}"'.format(
-                    self._parsed_data_uris[self._source_context][0]\
-                        ['chopped_path'],
-                    parameters['output']
-                )
-
-            else:
-                cmd += ' --{}="{}"'.format(
-                    param_key, parameters[param_key]
-                )
+        parameters = {
+            param_key: (
+                template[param_key] if param_key in template
+                else self._default_params[param_key]
+            )
+            for param_key in self._app['parameters']
+            if param_key in template or param_key in self._default_params
+        }
 
-        # add exeuction method
-        cmd += ' --exec_method="{}"'.format(self._step['execution']['method'])
+        # construct argument list for wrapper script, args are passed to the
+        # process without a shell, so values aren't quoted
+        args = [self._app['implementation']['local']['script']]
+        args.extend(
+            '--{}={}'.format(
+                input_key, URIParser.parse(input_value)['chopped_path']
+            )
+            for input_key, input_value in inputs.items() if input_value
+        )
+        args.extend(
+            '--output={}/{}'.format(self._data_path, param_value)
+            if param_key == 'output'
+            else '--{}={}'.format(param_key, param_value)
+            for param_key, param_value in parameters.items()
+        )
 
-        # specify execution init commands if 'init' param given
-        if 'init' in self._step['execution']['parameters']:
-            cmd += ' --exec_init="{}"'.format(self._step['execution']['parameters']['init'])
+        # add execution method and init commands
+        args.extend(self._exec_args)
 
-        # add stdout and stderr
+        # paths for stdout and stderr
         log_path = '{}/_log/gf-{}-{}-{}'.format(
-            self._parsed_data_uris[self._source_context][0]['chopped_path'],
+            self._data_path,
             map_item['attempt'],
-            slugify(self._step['name'], regex_pattern=r'[^-a-z0-9_]+'),
-            slugify(map_item['template']['output'], regex_pattern=r'[^-a-z0-9_]+')
+            self._slug_step_name,
+            job_name_slug(template['output'])
+        )
+
+        Log.a().debug(
+            'command: %s > %s.out 2> %s.err', args, log_path, log_path
         )
-        cmd += ' > "{}.out" 2> "{}.err"'.format(log_path, log_path)
 
-        Log.a().debug('command: %s', cmd)
+        # launch process, the process keeps its own handles of the log files
+        try:
+            with open(log_path+'.out', 'wb') as stdout_file, \
+                    open(log_path+'.err', 'wb') as stderr_file:
+                proc = ShellWrapper.spawn(
+                    args, stdout=stdout_file, stderr=stderr_file
+                )
+
+        except OSError as err:
+            msg = 'cannot open log files: {} [{}]'.format(log_path, str(err))
+            Log.an().error(msg)
+            return msg
 
-        # launch process
-        proc = ShellWrapper.spawn(cmd)
         if proc is False:
-            msg = 'shell process error: {}'.format(cmd)
+            msg = 'shell process error: {}'.format(args)
             Log.an().error(msg)
-            return self._fatal(msg)
+            return msg
 
         # record job info
         map_item['run'][map_item['attempt']]['proc'] = proc
@@ -311,7 +392,7 @@ class LocalStep(WorkflowStep):
         map_item['status'] = 'RUNNING'
         map_item['run'][map_item['attempt']]['status'] = 'RUNNING'
 
-        return True
+        return None
 
 
     def run(self):
@@ -334,24 +415,37 @@ class LocalStep(WorkflowStep):
             # exit without running anything new
             return True
 
-        for map_item in self._map:
-            if map_item['status'] == 'PENDING':
-                if not self._run_map(map_item):
-                    msg = 'cannot run script for map item "{}"'\
-                        .format(map_item['filename'])
-                    Log.an().error(msg)
-                    map_item['status'] = 'FAILED'
-                    map_item['run'][map_item['attempt']]['status']\
-                        = map_item['status']
+        # run pending map items, up to the throttle limit
+        pending_indexes = [
+            index for index, map_item in enumerate(self._map)
+            if map_item['status'] == 'PENDING'
+        ]
+        if self._throttle_limit > 0:
+            pending_indexes \
+                = pending_indexes[:self._throttle_limit-self._num_running]
+        pending_items = [self._map[index] for index in pending_indexes]
+
+        # spawn processes concurrently, each call only modifies its own map
+        # item, errors and changes are recorded here
+        errors = self._map_concurrent(
+            self._run_map, pending_items, MAX_SPAWN_THREADS
+        )
 
-                else:
-                    self._num_running += 1
-                    if (
-                        self._throttle_limit > 0
-                        and self._num_running >= self._throttle_limit
-                    ):
-                        # reached throttle limit
-                        break
+        for index, map_item, error in zip(
+                pending_indexes, pending_items, errors
+        ):
+            self._changed_items.add(index)
+            if error:
+                msg = 'cannot run script for map item "{}"'\
+                    .format(map_item['filename'])
+                Log.an().error(msg)
+                map_item['status'] = 'FAILED'
+                map_item['run'][map_item['attempt']]['status']\
+                    = map_item['status']
+                self._fatal(error)
+
+            else:
+                self._num_running += 1
 
         self._update_status_db('RUNNING', '')
 
@@ -368,16 +462,27 @@ class LocalStep(WorkflowStep):
             self: class instance.
 
         Returns:
-            A dict of all map items and their run histories.
+            A new dict of all map items and their run histories. The run
+            history lists are cached, so they must not be modified.
 
         """
-        return {
-            map_item['filename']: [
+        # only re-serialize map items that changed, unless the map itself
+        # changed
+        changed_items, self._changed_items = self._changed_items, set()
+        if len(self._detail_items) != len(self._map):
+            self._detail_items = [None]*len(self._map)
+            changed_items = range(len(self._map))
+        for index in changed_items:
+            self._detail_items[index] = [
                 {
                     'status': run_item.get('status', 'PENDING'),
                     'pid': run_item.get('pid', 0)
-                } for run_item in map_item['run']
-            ] for map_item in self._map
+                } for run_item in self._map[index]['run']
+            ]
+
+        return {
+            map_item['filename']: detail_item
+            for map_item, detail_item in zip(self._map, self._detail_items)
         }
 
 
@@ -392,8 +497,13 @@ class LocalStep(WorkflowStep):
             True.
 
         """
-        # check if procs are running, finished, or failed
-        for map_item in self._map:
+        # check if procs are running, finished, or failed, only if any
+        # process has exited
+        if not ShellWrapper.any_exited():
+            self._update_status_db(self._status, '')
+            return True
+
+        for index, map_item in enumerate(self._map):
             if map_item['status'] in ['RUNNING','UNKNOWN']:
                 try:
                     if not ShellWrapper.is_running(
@@ -423,8 +533,11 @@ class LocalStep(WorkflowStep):
                     )
                     map_item['status'] = 'UNKNOWN'
 
-                map_item['run'][map_item['attempt']]['status']\
-                    = map_item['status']
+                if map_item['run'][map_item['attempt']]['status']\
+                        != map_item['status']:
+                    map_item['run'][map_item['attempt']]['status']\
+                        = map_item['status']
+                    self._changed_items.add(index)
 
         self._update_status_db(self._status, '')
 
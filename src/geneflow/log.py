@@ -1,6 +1,7 @@
 """This module contains the GeneFlow Logging class."""
 
 import logging
+import pprint
 import sys
 
 
@@ -115,3 +116,37 @@ class Log:
 
         """
         return cls.LOGLEVEL_REV.get(cls.logger.level, 'info')
+
+
+class LazyFormat:
+    """
+    Pretty-print an object only when it is logged.
+
+    Pass an instance as a logging argument, e.g.,
+    Log.a().debug('dict:\n%s', LazyFormat(some_dict)), so that pprint
+    formatting is skipped when the log record is not emitted.
+    """
+
+    def __init__(self, obj):
+        """
+        Initialize the LazyFormat class.
+
+        Args:
+            self: class instance.
+            obj: object to pretty-print.
+
+        """
+        self._obj = obj
+
+    def __str__(self):
+        """
+        Pretty-print the object.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            Formatted string.
+
+        """
+        return pprint.pformat(self._obj)
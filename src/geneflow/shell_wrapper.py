@@ -42,19 +42,28 @@ class ShellWrapper:
 
 
     @staticmethod
-    def spawn(command):
+    def spawn(command, stdout=None, stderr=None):
         """
         Spawn a process and return it.
 
         Args:
-            command: The command to spawn a process.
+            command: The command to spawn a process. A string is run by the
+                shell, a list of args is executed directly.
+            stdout: file object for STDOUT of the process, inherited if None.
+            stderr: file object for STDERR of the process, inherited if None.
 
         Returns:
             The result of Popen, or raises an exception.
 
         """
         try:
-            return Popen(command, shell=True, env=os.environ)
+            return Popen(
+                command,
+                shell=isinstance(command, str),
+                stdout=stdout,
+                stderr=stderr,
+                env=os.environ
+            )
         except OSError as err:
             Log.an().error('spawn command failed: %s [%s]', command, str(err))
             return False
@@ -73,3 +82,30 @@ class ShellWrapper:
 
         """
         return proc.poll() is None
+
+
+    @staticmethod
+    def any_exited():
+        """
+        Check if any child process has exited, without reaping it.
+
+        A single waitid() call covers all child processes, so polling
+        each process can be skipped if none has exited.
+
+        Args:
+            None.
+
+        Returns:
+            False if no child process has exited, True if one has exited
+            or if it cannot be determined.
+
+        """
+        if not hasattr(os, 'waitid'):
+            return True
+
+        try:
+            return os.waitid(
+                os.P_ALL, 0, os.WEXITED|os.WNOHANG|os.WNOWAIT
+            ) is not None
+        except OSError:
+            return True
@@ -1,6 +1,9 @@
 """This module contains the GeneFlow Template Compiler class."""
 
 
+import os
+from pathlib import Path
+
 import jinja2
 
 from geneflow.log import Log
@@ -16,26 +19,73 @@ class TemplateCompiler:
     packaged with the GeneFlow source.
     """
 
-    @staticmethod
-    def compile_template(
+    # location of compiled template bytecode, shared across processes
+    BYTECODE_CACHE_PATH = Path.home() / '.geneflow' / 'jinja_cache'
+
+    # jinja2 environments, keyed by template search path
+    _environments = {}
+
+    @classmethod
+    def _get_environment(cls, template_path):
+        """
+        Get the Jinja2 environment for a template search path.
+
+        Environments are created once per search path and reused, so
+        templates are only parsed and compiled once per process. Compiled
+        templates are also cached on disk if the cache folder can be
+        created.
+
+        Args:
+            cls: class instance.
+            template_path: search path for templates.
+
+        Returns:
+            Jinja2 Environment instance.
+
+        """
+        template_path = str(template_path)
+        if template_path not in cls._environments:
+            bytecode_cache = None
+            try:
+                cls.BYTECODE_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = jinja2.FileSystemBytecodeCache(
+                    directory=str(cls.BYTECODE_CACHE_PATH)
+                )
+            except OSError as err:
+                Log.a().debug(
+                    'cannot create template cache folder: %s [%s]',
+                    cls.BYTECODE_CACHE_PATH, str(err)
+                )
+
+            cls._environments[template_path] = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(searchpath=template_path),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                bytecode_cache=bytecode_cache
+            )
+
+        return cls._environments[template_path]
+
+    @classmethod
+    def render_template(
+            cls,
             template_path,
             template_name,
-            compiled_name,
             **kwargs
     ):
         """
-        Compile a GeneFlow template file.
+        Render a GeneFlow template file to a string.
 
         Args:
+            cls: class instance.
             template_path: search path for templates. If omitted, the
                 GeneFlow package path of data/templates is used.
             template_name: name of the template file, must be stored in
                 data/templates of the GeneFlow source package.
-            compiled_name: full path of the compiled target file.
             kwargs: data to populate the template.
 
         Returns:
-            On success: True.
+            On success: rendered template (str).
             On failure: False.
 
         """
@@ -45,14 +95,7 @@ class TemplateCompiler:
 
         # load template
         try:
-            template_loader = jinja2.FileSystemLoader(
-                searchpath=str(template_path)
-            )
-            template_env = jinja2.Environment(
-                loader=template_loader,
-                trim_blocks=True,
-                lstrip_blocks=True
-            )
+            template_env = cls._get_environment(template_path)
             template = template_env.get_template(template_name)
 
         except jinja2.TemplateSyntaxError as err:
@@ -72,10 +115,53 @@ class TemplateCompiler:
             )
             return False
 
-        # compile and write
+        # compile
+        try:
+            return template.render(**kwargs)
+
+        except jinja2.TemplateError as err:
+            Log.a().warning(
+                'cannot compile template: %s [%s]', template_name, str(err)
+            )
+            return False
+
+    @classmethod
+    def compile_template(
+            cls,
+            template_path,
+            template_name,
+            compiled_name,
+            mode=None,
+            **kwargs
+    ):
+        """
+        Compile a GeneFlow template file.
+
+        Args:
+            cls: class instance.
+            template_path: search path for templates. If omitted, the
+                GeneFlow package path of data/templates is used.
+            template_name: name of the template file, must be stored in
+                data/templates of the GeneFlow source package.
+            compiled_name: full path of the compiled target file.
+            mode: permissions to set on the compiled file, if specified.
+            kwargs: data to populate the template.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        compiled = cls.render_template(template_path, template_name, **kwargs)
+        if compiled is False:
+            return False
+
+        # write
         try:
             with open(str(compiled_name), 'w') as compiled_file:
-                compiled_file.write(template.render(**kwargs))
+                compiled_file.write(compiled)
+                if mode is not None:
+                    os.fchmod(compiled_file.fileno(), mode)
 
         except IOError as err:
             Log.an().warning(
@@ -84,10 +170,4 @@ class TemplateCompiler:
             )
             return False
 
-        except jinja2.TemplateError as err:
-            Log.a().warning(
-                'cannot compile template: %s [%s]', template_name, str(err)
-            )
-            return False
-
         return True
@@ -1,6 +1,7 @@
 """This module contains the GeneFlow URIParser class."""
 
 # import system modules
+from functools import lru_cache
 import re
 # import custom modules
 from geneflow.log import Log
@@ -53,16 +54,18 @@ class URIParser:
 
     """
 
-    # regular expressions for parsing the URI
-    uri_regex = "^(([^:/]+):)?(//([^/]*))?(.*?)$"
-    path_regex = "^(.*?)(/?)([^/]+)?$"
+    # regular expressions for parsing the URI, compiled once at import
+    uri_regex = re.compile("^(([^:/]+):)?(//([^/]*))?(.*?)$")
+    path_regex = re.compile("^(.*?)(/?)([^/]+)?$")
+    slashes_regex = re.compile('/+')
 
     @classmethod
     def parse(cls, uri):
         """
         Parse a URI and return components. If the scheme is missing, it..
 
-        defaults to "local".
+        defaults to "local". Parse results are cached, and a new dict is
+        returned for each call so callers can safely modify it.
 
         Args:
             uri: A generic URI string.
@@ -85,7 +88,28 @@ class URIParser:
             On failure: False.
 
         """
-        matched = re.match(cls.uri_regex, str(uri))
+        parsed_uri = cls._parse(str(uri))
+        if not parsed_uri:
+            return False
+
+        return dict(parsed_uri, uri=uri) # original URI
+
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _parse(cls, uri):
+        """
+        Parse a URI string and return components, see parse().
+
+        Args:
+            uri: A generic URI string.
+
+        Returns:
+            On success: A dict of URI components.
+            On failure: False.
+
+        """
+        matched = cls.uri_regex.match(uri)
         if not matched:
             Log.a().debug('invalid uri: %s', uri)
             return False
@@ -100,10 +124,10 @@ class URIParser:
         path = matched.group(5) if matched.group(5) else '/'
 
         # replace one or more consecutive slashes with single slash
-        path = re.sub('/+', '/', path)
+        path = cls.slashes_regex.sub('/', path)
 
         # get folder and name from path
-        matched = re.match(cls.path_regex, path)
+        matched = cls.path_regex.match(path)
         if not matched:
             Log.a().debug('invalid path of uri: %s', path)
             return False
@@ -1,23 +1,24 @@
 """This module contains the GeneFlow Workflow installer class."""
 
 
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from pathlib import Path
 import pprint
+import threading
 import yaml
 
 try:
     from agavepy.agave import Agave
 except ImportError: pass
 
-from git import Repo
-from git.exc import GitError
 import requests
 from slugify import slugify
 
 from geneflow.app_installer import AppInstaller
 from geneflow.data_manager import DataManager
 from geneflow.definition import Definition
+from geneflow import yaml_io
 from geneflow.log import Log
 from geneflow.template_compiler import TemplateCompiler
 from geneflow.uri_parser import URIParser
@@ -37,6 +38,9 @@ class WorkflowInstaller:
     from a GeneFlow git repo.
     """
 
+    # max number of apps to install concurrently
+    MAX_INSTALL_WORKERS = 16
+
     def __init__(
             self,
             path,
@@ -50,7 +54,8 @@ class WorkflowInstaller:
             agave_username=None,
             agave_domain=None,
             agave_publish=False,
-            make_apps=True
+            make_apps=True,
+            partial_clone=False
     ):
         """
         Initialize the GeneFlow WorkflowInstaller class.
@@ -69,6 +74,7 @@ class WorkflowInstaller:
             agave_username: agave username to impersonate when installing apps
             agave_publish: publish agave app?
             make_apps: compile app templates
+            partial_clone: use partial (blobless) clones for app repos
 
         Returns:
             None
@@ -81,6 +87,7 @@ class WorkflowInstaller:
         self._app_name = app_name
         self._clean = clean
         self._make_apps = make_apps
+        self._partial_clone = partial_clone
 
         self._workflow_yaml = None
 
@@ -91,6 +98,7 @@ class WorkflowInstaller:
         self._agave_username = agave_username
         self._agave_domain = agave_domain
         self._agave_publish = agave_publish
+        self._agave_lock = threading.Lock()
 
 
     def initialize(self):
@@ -175,17 +183,13 @@ class WorkflowInstaller:
     @classmethod
     def _yaml_to_dict(cls, path):
 
-        # read yaml file
+        # read yaml file and convert to dict
         try:
-            with open(path, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
+            with open(path, 'rb') as yaml_file:
+                yaml_dict = yaml_io.safe_load(yaml_file)
         except IOError as err:
             Log.an().warning('cannot read yaml file: %s [%s]', path, str(err))
             return False
-
-        # convert to dict
-        try:
-            yaml_dict = yaml.safe_load(yaml_data)
         except yaml.YAMLError as err:
             Log.an().warning('invalid yaml file: %s [%s]', path, str(err))
             return False
@@ -195,6 +199,10 @@ class WorkflowInstaller:
 
     def _clone_workflow(self):
 
+        # GitPython is only needed when cloning
+        from git import Repo
+        from git.exc import GitError
+
         if not self._git:
             Log.an().error('must specify a git url to clone workflow')
             return False
@@ -229,6 +237,9 @@ class WorkflowInstaller:
         """
         Install apps for the workflow package.
 
+        Apps are cloned and compiled in parallel. Agave registration of each
+        app is serialized since it shares a single Agave client.
+
         Args:
             self: class instance.
 
@@ -245,85 +256,159 @@ class WorkflowInstaller:
         # create apps folder if not already there
         apps_path.mkdir(exist_ok=True)
 
-        for app in self._workflow['apps']:
-            if self._app_name == app or not self._app_name:
+        apps = [
+            app for app in self._workflow['apps']
+            if self._app_name == app or not self._app_name
+        ]
+        if not apps:
+            return True
 
-                Log.some().info(
-                    'app: %s:%s [%s]',
-                    app,
-                    self._workflow['apps'][app]['git'],
-                    self._workflow['apps'][app]['version']
-                )
+        # create main agave apps uri once, shared by all apps
+        if (
+                self._agave_wrapper
+                and self._agave_params
+                and self._agave_params.get('agave')
+        ):
+            if not self._create_agave_apps_uri():
+                return False
+
+        with ThreadPoolExecutor(
+                max_workers=min(self.MAX_INSTALL_WORKERS, len(apps))
+        ) as executor:
+            results = list(executor.map(
+                lambda app: self._install_app(app, apps_path), apps
+            ))
+
+        return all(results)
+
+
+    def _create_agave_apps_uri(self):
+        """
+        Create the main agave apps uri for app registration.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        parsed_agave_apps_uri = URIParser.parse(
+            'agave://{}/{}'.format(
+                self._agave_params['agave']['deploymentSystem'],
+                self._agave_params['agave']['appsDir']
+            )
+        )
+        Log.some().info(
+            'creating main apps uri: %s',
+            parsed_agave_apps_uri['chopped_uri']
+        )
+        if not DataManager.mkdir(
+                parsed_uri=parsed_agave_apps_uri,
+                recursive=True,
+                agave={
+                    'agave_wrapper': self._agave_wrapper
+                }
+        ):
+            Log.an().error('cannot create main agave apps uri')
+            return False
+
+        return True
+
+
+    def _install_app(self, app, apps_path):
+        """
+        Clone, compile, and register a single app.
+
+        Args:
+            self: class instance.
+            app: name of app in workflow definition.
+            apps_path: path of apps folder in workflow package.
 
-                repo_path = apps_path / slugify(app, regex_pattern=r'[^-a-z0-9_]+')
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        Log.some().info(
+            'app: %s:%s [%s]',
+            app,
+            self._workflow['apps'][app]['git'],
+            self._workflow['apps'][app]['version']
+        )
+
+        repo_path = apps_path / slugify(app, regex_pattern=r'[^-a-z0-9_]+')
+
+        # create AppInstaller instance
+        app_installer = AppInstaller(
+            str(repo_path),
+            {
+                'name': app,
+                **self._workflow['apps'][app]
+            },
+            partial_clone=self._partial_clone
+        )
+
+        # clone app into install location
+        if not app_installer.clone_git_repo():
+            Log.an().error('cannot clone app to %s', str(repo_path))
+            return False
 
-                # create AppInstaller instance
-                app_installer = AppInstaller(
-                    str(repo_path),
-                    {
-                        'name': app,
-                        **self._workflow['apps'][app]
-                    }
+        if not app_installer.load_app():
+            Log.an().error('cannot load app config')
+            return False
+
+        if self._make_apps:
+            if not app_installer.make():
+                Log.an().error('cannot compile app templates')
+                return False
+
+
+        # register in Agave
+        if (
+                self._agave_wrapper
+                and self._agave_params
+                and self._agave_params.get('agave')
+        ):
+            with self._agave_lock:
+                register_result = app_installer.register_agave_app(
+                    self._agave_wrapper,
+                    self._agave_params,
+                    self._agave_publish
                 )
+            if not register_result:
+                Log.an().error(
+                    'cannot register app "%s" in agave', app
+                )
+                return False
 
-                # clone app into install location
-                if not app_installer.clone_git_repo():
-                    Log.an().error('cannot clone app to %s', str(repo_path))
-                    return False
+            Log.some().info(
+                'registered agave app:\n%s',
+                pprint.pformat(register_result)
+            )
 
-                if not app_installer.load_app():
-                    Log.an().error('cannot load app config')
-                    return False
+            # update app definition with implementation section
+            if not app_installer.update_def(
+                agave={
+                    'apps_prefix': self._agave_params['agave']['appsPrefix'],
+                    'revision': register_result['revision']
+                }
+            ):
+                Log.an().error(
+                    'cannot update app "%s" definition',
+                    app
+                )
+                return False
 
-                if self._make_apps:
-                    if not app_installer.make():
-                        Log.an().error('cannot compile app templates')
-                        return False
-
-
-                # register in Agave
-                if (
-                        self._agave_wrapper
-                        and self._agave_params
-                        and self._agave_params.get('agave')
-                ):
-                    register_result = app_installer.register_agave_app(
-                        self._agave_wrapper,
-                        self._agave_params,
-                        self._agave_publish
-                    )
-                    if not register_result:
-                        Log.an().error(
-                            'cannot register app "%s" in agave', app
-                        )
-                        return False
-
-                    Log.some().info(
-                        'registered agave app:\n%s',
-                        pprint.pformat(register_result)
-                    )
-
-                    # update app definition with implementation section
-                    if not app_installer.update_def(
-                        agave={
-                            'apps_prefix': self._agave_params['agave']['appsPrefix'],
-                            'revision': register_result['revision']
-                        }
-                    ):
-                        Log.an().error(
-                            'cannot update app "%s" definition',
-                            app
-                        )
-                        return False
-
-                else:
-                    # update app definition with implementation section
-                    if not app_installer.update_def(agave=None):
-                        Log.an().error(
-                            'cannot update app "%s" definition',
-                            app
-                        )
-                        return False
+        else:
+            # update app definition with implementation section
+            if not app_installer.update_def(agave=None):
+                Log.an().error(
+                    'cannot update app "%s" definition',
+                    app
+                )
+                return False
 
         return True
 
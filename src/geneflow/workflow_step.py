@@ -1,5 +1,6 @@
 """This module contains the GeneFlow WorkflowStep class."""
 
+from concurrent.futures import ThreadPoolExecutor
 import json
 import regex as re
 
@@ -597,6 +598,32 @@ class WorkflowStep(StageableData):
         }
 
 
+    @staticmethod
+    def _map_concurrent(func, items, max_workers):
+        """
+        Call a function for each item concurrently.
+
+        Used for latency-bound calls, e.g., job submits and status checks,
+        that don't modify the step.
+
+        Args:
+            func: function to call with each item.
+            items: list of items.
+            max_workers: maximum number of threads.
+
+        Returns:
+            List of results, in the same order as items.
+
+        """
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(items))
+        ) as executor:
+            return list(executor.map(func, items))
+
+
     def _fatal(self, msg):
         """
         Update database with error message and set status.
@@ -0,0 +1,41 @@
+"""This module contains GeneFlow YAML loading functions."""
+
+import yaml
+
+from geneflow.log import Log
+
+# use the libyaml-backed loader if available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+Log.a().debug('libyaml yaml loader enabled: %s', yaml.__with_libyaml__)
+
+
+def safe_load(stream):
+    """
+    Load a single YAML doc.
+
+    Args:
+        stream: YAML string, bytes, or open file.
+
+    Returns:
+        Loaded YAML doc.
+
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_load_all(stream):
+    """
+    Load all docs of a multi-doc YAML file.
+
+    Args:
+        stream: YAML string, bytes, or open file.
+
+    Returns:
+        List of loaded YAML docs.
+
+    """
+    return list(yaml.load_all(stream, Loader=SafeLoader))